@@ -2,6 +2,7 @@ from flask import Flask
 from flask_cors import CORS
 import os
 from dotenv import load_dotenv
+from config import Config
 
 # Load environment variables
 load_dotenv()
@@ -25,6 +26,14 @@ else:
         }
     })
 
+# Fast JSON encoding and compression of large responses
+from app.responses import init_app as init_responses
+init_responses(app)
+
+# Cap request bodies at the photo size limit
+from app.photos import init_app as init_photos
+init_photos(app)
+
 # Import routes
 from app.routes import auth, complaints, admin, worker
 
@@ -34,6 +43,19 @@ app.register_blueprint(complaints.bp)
 app.register_blueprint(admin.bp)
 app.register_blueprint(worker.bp)
 
+# Start background escalation sweeps (one leader process per host)
+from app.escalation import start_scheduler
+start_scheduler()
+
+# Finish photo uploads left in the spool by an earlier process
+from app.photos import recover_spooled_uploads
+recover_spooled_uploads()
+
+# Optionally build the Supabase client before the first request arrives
+if Config.WARM_UP_ON_START:
+    from app.warmup import start_warm_up
+    start_warm_up()
+
 @app.route('/')
 def home():
     return {'message': 'Complaint Management System API', 'status': 'running'}
@@ -8,10 +8,26 @@ def create_app():
     
     CORS(app)
     
+    from app.responses import init_app as init_responses
+    init_responses(app)
+    
+    from app.photos import init_app as init_photos
+    init_photos(app)
+    
     from app.routes import auth, complaints, admin, worker
     app.register_blueprint(auth.bp)
     app.register_blueprint(complaints.bp)
     app.register_blueprint(admin.bp)
     app.register_blueprint(worker.bp)
     
+    from app.escalation import start_scheduler
+    start_scheduler()
+    
+    from app.photos import recover_spooled_uploads
+    recover_spooled_uploads()
+    
+    if Config.WARM_UP_ON_START:
+        from app.warmup import start_warm_up
+        start_warm_up()
+    
     return app
@@ -1,21 +1,108 @@
+from collections import OrderedDict
 from functools import wraps
 from flask import request, jsonify
+import hashlib
+import threading
+import time
 import jwt
 from config import Config
+from app.database import get_supabase_client
+from app.admin_roles import get_admin_claims, claims_stale
+from app.user_loader import remember_user
+
+# Verified tokens kept so repeat requests skip signature checks
+TOKEN_CACHE_SIZE = 1024
+# Cache lifetime for tokens minted without an exp claim
+TOKEN_CACHE_DEFAULT_TTL = 300
+
+# Stream tokens travel in the URL (EventSource cannot set headers), where
+# proxies and access logs see them, so they are scoped and short-lived
+STREAM_TOKEN_SCOPE = 'event-stream'
+STREAM_TOKEN_TTL_SECONDS = 300
+STREAM_TOKEN_CLAIMS = ('user_id', 'student_id', 'role', 'admin_role', 'hostel')
+
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def decode_token(token):
+    """Verify a JWT, reusing the result for the same token until it expires"""
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    now = time.time()
+    
+    with _token_cache_lock:
+        entry = _token_cache.get(digest)
+        if entry:
+            if entry[0] > now:
+                _token_cache.move_to_end(digest)
+                return dict(entry[1])
+            del _token_cache[digest]
+    
+    data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=['HS256'])
+    expires_at = data.get('exp', now + TOKEN_CACHE_DEFAULT_TTL)
+    
+    with _token_cache_lock:
+        _token_cache[digest] = (expires_at, dict(data))
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    
+    return data
+
+def issue_stream_token(claims):
+    """Token that only opens event streams, valid for STREAM_TOKEN_TTL_SECONDS"""
+    expires_at = int(time.time()) + STREAM_TOKEN_TTL_SECONDS
+    payload = {key: claims[key] for key in STREAM_TOKEN_CLAIMS if key in claims}
+    # Admin claims were just resolved, so trust them for the token's lifetime
+    payload.update(scope=STREAM_TOKEN_SCOPE, exp=expires_at, claims_exp=expires_at)
+    return jwt.encode(payload, Config.JWT_SECRET_KEY, algorithm='HS256')
+
+class AuthContext:
+    """Per-request auth state: verified claims plus the lazily loaded user row"""
+    def __init__(self, claims):
+        self.claims = claims
+        self._current_user = None
+        self._loaded = False
+    
+    @property
+    def user_id(self):
+        return self.claims['user_id']
+    
+    @property
+    def current_user(self):
+        """The caller's users row, fetched at most once per request"""
+        if not self._loaded:
+            result = get_supabase_client().table('users').select('*').eq('id', self.user_id).execute()
+            self._current_user = result.data[0] if result.data else None
+            self._loaded = True
+            if self._current_user:
+                remember_user(self._current_user)
+        return self._current_user
 
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
         token = request.headers.get('Authorization')
         
+        # EventSource cannot set headers, so event streams pass a stream token as ?token=
+        from_query = False
+        if not token and request.accept_mimetypes.best == 'text/event-stream':
+            token = request.args.get('token')
+            from_query = True
+        
         if not token:
             return jsonify({'error': 'Token is missing'}), 401
         
         try:
             if token.startswith('Bearer '):
                 token = token[7:]
-            data = jwt.decode(token, Config.JWT_SECRET_KEY, algorithms=['HS256'])
+            data = decode_token(token)
+            # Login tokens never go in URLs, and stream tokens only open streams
+            if from_query != (data.get('scope') == STREAM_TOKEN_SCOPE):
+                return jsonify({'error': 'Invalid token'}), 401
+            # Old tokens and expired embedded claims are re-resolved from cache
+            if data.get('role') == 'admin' and claims_stale(data):
+                data.update(get_admin_claims(get_supabase_client(), data['user_id']))
             request.user = data
+            request.auth = AuthContext(data)
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token has expired'}), 401
         except jwt.InvalidTokenError:
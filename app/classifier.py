@@ -0,0 +1,140 @@
+import json
+import re
+import threading
+import unicodedata
+from config import Config
+
+# Keyword sets by language; more can be added with EMERGENCY_KEYWORDS_FILE,
+# a JSON object mapping a set name to a list of keywords
+DEFAULT_KEYWORDS = {
+    'en': ['fire', 'water leakage', 'short circuit', 'medical emergency', 'urgent', 'emergency']
+}
+
+def _indic_chars(categories):
+    """Regex class body for Indic script characters (U+0900-U+0DFF) in the given categories"""
+    codes = [code for code in range(0x0900, 0x0E00) if unicodedata.category(chr(code)) in categories]
+    ranges = []
+    for code in codes:
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ''.join(f'\\u{start:04x}' + (f'-\\u{end:04x}' if end > start else '') for start, end in ranges)
+
+# A character that continues a word. \w misses the vowel signs and viramas of
+# Devanagari and the other Indic scripts, so without them "आग" would match
+# inside "आगे"; native digits are \w but, like dandas, end a word in practice
+# ("आग१"), so they are left out
+WORD_CHAR = rf"(?:[^\W{_indic_chars(('Nd',))}]|[{_indic_chars(('Mn', 'Mc', 'Me'))}])"
+
+# Words in a multi-word keyword may be separated by whitespace or hyphens
+WORD_SEPARATOR = re.compile(r'[\s-]+')
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+def _trie_pattern(node):
+    """Regex for a keyword trie, so shared prefixes are matched only once"""
+    end = '' in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+
+    if not branches:
+        return ''
+    if len(branches) == 1 and not end:
+        return branches[0]
+    pattern = '(?:' + '|'.join(branches) + ')'
+    return pattern + '?' if end else pattern
+
+def normalize_keyword(text):
+    """Lowercase and join words with single spaces, so "Short-circuit" == "short circuit\""""
+    return ' '.join(word for word in WORD_SEPARATOR.split(text.lower()) if word)
+
+def compile_keywords(keywords):
+    """Compile keywords into a single case-insensitive, whole-word pattern"""
+    trie = {}
+    for keyword in keywords:
+        keyword = normalize_keyword(keyword)
+        if not keyword:
+            continue
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    if not trie:
+        # Nothing to match: a pattern that never succeeds
+        return re.compile(r'(?!)')
+
+    pattern = _trie_pattern(trie).replace(re.escape(' '), WORD_SEPARATOR.pattern)
+    return re.compile(rf'(?<!{WORD_CHAR})(?:{pattern})(?!{WORD_CHAR})', re.IGNORECASE)
+
+class EmergencyClassifier:
+    """Flags descriptions containing any emergency keyword in one regex pass"""
+    def __init__(self, keyword_sets=None):
+        keyword_sets = keyword_sets or DEFAULT_KEYWORDS
+        self.keywords = sorted({k for keywords in keyword_sets.values() for k in keywords})
+        self.pattern = compile_keywords(self.keywords)
+
+    def is_emergency(self, text):
+        return bool(text) and self.pattern.search(text) is not None
+
+    def matches(self, text):
+        """Keywords found in text, normalized as by normalize_keyword"""
+        return [normalize_keyword(m) for m in self.pattern.findall(text or '')]
+
+    def classify_batch(self, texts):
+        return [self.is_emergency(text) for text in texts]
+
+def load_keyword_sets():
+    keyword_sets = dict(DEFAULT_KEYWORDS)
+    if Config.EMERGENCY_KEYWORDS_FILE:
+        with open(Config.EMERGENCY_KEYWORDS_FILE, encoding='utf-8') as f:
+            keyword_sets.update(json.load(f))
+    return keyword_sets
+
+def get_classifier():
+    """Shared classifier, compiled on first use"""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = EmergencyClassifier(load_keyword_sets())
+        return _classifier
+
+def reclassify_complaints(supabase, batch_size=500, dry_run=False):
+    """Re-run the classifier over pending complaints.
+
+    Only complaints still awaiting validation are touched. Rows whose flag
+    changes are updated with one statement per batch and direction.
+    Returns the ids that were (or, for a dry run, would be) changed.
+    """
+    classifier = get_classifier()
+    changed = {'flagged': [], 'cleared': []}
+    last_id = None
+
+    while True:
+        query = supabase.table('complaints').select('id, description, is_emergency').eq('status', 'pending')
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        batch = query.order('id').limit(batch_size).execute().data or []
+        if not batch:
+            break
+        last_id = batch[-1]['id']
+
+        flagged, cleared = [], []
+        for complaint, is_emergency in zip(batch, classifier.classify_batch(c['description'] for c in batch)):
+            if is_emergency and not complaint.get('is_emergency'):
+                flagged.append(complaint['id'])
+            elif not is_emergency and complaint.get('is_emergency'):
+                cleared.append(complaint['id'])
+
+        if not dry_run:
+            if flagged:
+                supabase.table('complaints').update({'is_emergency': True, 'priority': 'high'}).in_('id', flagged).execute()
+            if cleared:
+                # Also undo the 'high' priority they were given when flagged
+                supabase.table('complaints').update({'is_emergency': False, 'priority': 'medium'}).in_('id', cleared).execute()
+
+        changed['flagged'].extend(flagged)
+        changed['cleared'].extend(cleared)
+
+    return changed
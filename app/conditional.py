@@ -0,0 +1,41 @@
+import hashlib
+import json
+from flask import Response, request
+
+# Columns read by the validator query; updated_at is kept current by
+# sql/complaints_updated_at.sql
+VALIDATOR_COLUMNS = 'updated_at, created_at'
+
+def scope_validator(query):
+    """Row count and latest change for the complaints a filtered query covers.
+
+    query must select VALIDATOR_COLUMNS with count='exact' and carry the same
+    filters as the list it validates. Only one row is transferred.
+    """
+    result = query.order('updated_at', desc=True).limit(1).execute()
+    latest = result.data[0] if result.data else {}
+    return [result.count or 0, latest.get('updated_at'), latest.get('created_at')]
+
+def list_etag(*validators):
+    """Weak ETag for the caller's view of a list.
+
+    Combines the scope validators with the caller and the query string, since
+    fields, filters and cursors change the response for the same rows.
+    """
+    user = request.user
+    key = [user.get('user_id'), user.get('role'), user.get('admin_role'),
+           request.query_string.decode(), list(validators)]
+    return hashlib.sha1(json.dumps(key, default=str).encode()).hexdigest()
+
+def not_modified_response(etag):
+    """304 response if the client's If-None-Match already holds etag, else None"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    return with_etag(Response(status=304), etag)
+
+def with_etag(response, etag):
+    """Attach the ETag plus headers that make browsers revalidate before reuse"""
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Authorization')
+    return response
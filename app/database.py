@@ -1,7 +1,19 @@
-from supabase import create_client, Client
+import threading
 from config import Config
 
-supabase: Client = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+_client = None
+_client_lock = threading.Lock()
 
 def get_supabase_client():
-    return supabase
+    """Shared Supabase client, created on first use.
+
+    The supabase SDK is imported here rather than at module load so cold
+    starts that never touch the database (e.g. /health) skip it entirely.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from supabase import create_client
+                _client = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+    return _client
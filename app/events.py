@@ -0,0 +1,152 @@
+import json
+import queue
+import threading
+import time
+from config import Config
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15
+
+# Events buffered per subscriber before a slow client starts losing them
+MAX_QUEUED_EVENTS = 100
+
+# Postgres channel used to fan events out across processes (sql/complaint_events.sql)
+CHANNEL = 'complaint_events'
+
+# Pause before reconnecting a dropped LISTEN connection
+LISTEN_RETRY_SECONDS = 5
+
+# pg_notify rejects payloads of 8000 bytes or more; this leaves room for the
+# event name and hostel around the data
+MAX_NOTIFY_DATA_BYTES = 7000
+
+# Text fields in an oversized payload are cut to this many characters
+TRUNCATED_FIELD_CHARS = 200
+
+_subscribers = []
+_subscribers_lock = threading.Lock()
+_listener = None
+
+class Subscription:
+    def __init__(self, hostel=None):
+        self.hostel = hostel
+        self.queue = queue.Queue(maxsize=MAX_QUEUED_EVENTS)
+
+    def wants(self, hostel):
+        # Same rule as get_emergency_complaints: admins with a hostel only
+        # see events from that hostel
+        return not self.hostel or self.hostel == hostel
+
+def available():
+    """Whether streams can receive pushes here: serverless instances only see
+    events from other invocations through Postgres NOTIFY"""
+    return bool(Config.DATABASE_URL) or not Config.SERVERLESS
+
+def subscribe(hostel=None):
+    subscription = Subscription(hostel)
+    with _subscribers_lock:
+        _subscribers.append(subscription)
+    _ensure_listener()
+    return subscription
+
+def unsubscribe(subscription):
+    with _subscribers_lock:
+        if subscription in _subscribers:
+            _subscribers.remove(subscription)
+
+def _deliver(event, data, hostel=None):
+    """Queue an event for every subscriber in this process interested in the hostel"""
+    message = f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    with _subscribers_lock:
+        subscribers = list(_subscribers)
+    for subscription in subscribers:
+        if subscription.wants(hostel):
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                print(f"Warning: Dropping {event} event for slow subscriber")
+
+def _fit_notify_payload(data):
+    """data, with text fields truncated if needed to fit a NOTIFY; None if it still does not fit"""
+    if len(json.dumps(data, default=str).encode()) <= MAX_NOTIFY_DATA_BYTES:
+        return data
+    data = {key: value[:TRUNCATED_FIELD_CHARS] if isinstance(value, str) else value for key, value in data.items()}
+    if len(json.dumps(data, default=str).encode()) <= MAX_NOTIFY_DATA_BYTES:
+        return data
+    return None
+
+def publish(event, data, hostel=None, supabase=None):
+    """Send an event to every stream subscribed to the hostel.
+
+    With DATABASE_URL set the event goes through Postgres NOTIFY, so streams
+    held by any process or instance receive it; otherwise only streams in
+    this process do. NOTIFY payloads are capped at 8000 bytes, so long text
+    fields are truncated first.
+    """
+    if not Config.DATABASE_URL:
+        _deliver(event, data, hostel)
+        return
+
+    fitted = _fit_notify_payload(data)
+    if fitted is None:
+        print(f"Warning: Dropping {event} event: payload too large for NOTIFY")
+        return
+    try:
+        from app.database import get_supabase_client
+        (supabase or get_supabase_client()).rpc('publish_complaint_event', {
+            'p_event': event,
+            'p_hostel': hostel,
+            'p_data': fitted
+        }).execute()
+    except Exception as e:
+        # Dashboards still poll, so a lost push only delays the update
+        print(f"Warning: Could not publish {event} event: {e}")
+
+def _listen():
+    """Relay NOTIFYs on CHANNEL to this process's subscribers, reconnecting on errors"""
+    import psycopg
+    while True:
+        try:
+            with psycopg.connect(Config.DATABASE_URL, autocommit=True) as conn:
+                conn.execute(f'LISTEN {CHANNEL}')
+                for notify in conn.notifies():
+                    payload = json.loads(notify.payload)
+                    _deliver(payload['event'], payload.get('data'), payload.get('hostel'))
+        except Exception as e:
+            print(f"Warning: Event listener disconnected: {e}")
+        time.sleep(LISTEN_RETRY_SECONDS)
+
+def _ensure_listener():
+    """Start the LISTEN thread the first time this process holds a stream"""
+    global _listener
+    if not Config.DATABASE_URL:
+        return
+    with _subscribers_lock:
+        if _listener is not None:
+            return
+        _listener = threading.Thread(target=_listen, name='event-listener', daemon=True)
+    _listener.start()
+
+def stream(subscription, max_seconds=0):
+    """Yield Server-Sent Events for a subscription until the client disconnects.
+
+    With max_seconds the stream ends early with a 'bye' event and the browser
+    reconnects, for hosts that cap response duration (e.g. serverless
+    functions); clients need not catch up after a planned reconnect.
+    """
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            timeout = HEARTBEAT_SECONDS
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    yield 'event: bye\ndata: {}\n\n'
+                    return
+            try:
+                yield subscription.queue.get(timeout=timeout)
+            except queue.Empty:
+                yield ': keep-alive\n\n'
+    finally:
+        unsubscribe(subscription)
@@ -0,0 +1,35 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from config import Config
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=Config.FANOUT_WORKERS, thread_name_prefix='fan-out')
+        return _executor
+
+def fan_out(*calls):
+    """Run independent zero-argument callables concurrently; returns their results in order.
+
+    The first call runs on the calling thread, so it may use request or g;
+    the rest run on a bounded shared pool and must only touch the Supabase
+    client and their own arguments. Every call finishes before the first
+    exception (if any) is re-raised.
+    """
+    if not calls:
+        return []
+    if len(calls) == 1 or Config.FANOUT_WORKERS <= 0:
+        return [call() for call in calls]
+    
+    executor = _get_executor()
+    futures = [executor.submit(call) for call in calls[1:]]
+    try:
+        first = calls[0]()
+    finally:
+        wait(futures)
+    
+    return [first] + [future.result() for future in futures]
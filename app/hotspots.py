@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from app.pagination import paginate
+
+# Complaints older than this no longer count towards a hotspot
+WINDOW = timedelta(days=7)
+
+# Re-read the window from the database this often, so complaints filed
+# through other processes are picked up
+REFRESH_SECONDS = 300
+
+# Rows read per query while warming; paginate() asks for one extra row, so
+# this stays below Supabase's 1000-row response cap
+WARM_PAGE_SIZE = 500
+
+_index = {}
+_lock = threading.Lock()
+_warmed_at = None
+
+def _parse_timestamp(value):
+    """UTC naive datetime from a Supabase timestamp string"""
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        parsed = datetime.fromisoformat(value[:19])
+    if parsed.tzinfo:
+        parsed = parsed.replace(tzinfo=None) - parsed.utcoffset()
+    return parsed
+
+def _prune(timestamps, cutoff):
+    while timestamps and timestamps[0] < cutoff:
+        timestamps.popleft()
+
+def warm(supabase):
+    """Rebuild the index from complaints filed inside the window"""
+    global _index, _warmed_at
+    since = (datetime.utcnow() - WINDOW).isoformat()
+
+    index = {}
+    cursor = None
+    while True:
+        query = supabase.table('complaints').select('id, category, location, created_at').gte('created_at', since)
+        rows, next_cursor = paginate(query, WARM_PAGE_SIZE, cursor)
+        # Pages come newest first; appendleft keeps each deque oldest first for _prune
+        for complaint in rows:
+            key = (complaint['category'], complaint['location'])
+            index.setdefault(key, deque()).appendleft(_parse_timestamp(complaint['created_at']))
+        if not next_cursor:
+            break
+        cursor = (rows[-1]['created_at'], rows[-1]['id'])
+
+    with _lock:
+        _index = index
+        _warmed_at = time.monotonic()
+
+def _ensure_warm(supabase):
+    if _warmed_at is None or time.monotonic() - _warmed_at > REFRESH_SECONDS:
+        warm(supabase)
+
+def record(category, location, created_at=None):
+    """Count a newly filed complaint"""
+    with _lock:
+        _index.setdefault((category, location), deque()).append(created_at or datetime.utcnow())
+
+def count(supabase, category, location):
+    """Complaints with this category and location inside the window"""
+    _ensure_warm(supabase)
+    cutoff = datetime.utcnow() - WINDOW
+    with _lock:
+        timestamps = _index.get((category, location))
+        if not timestamps:
+            return 0
+        _prune(timestamps, cutoff)
+        return len(timestamps)
+
+def top(supabase, limit=10):
+    """Most frequent (category, location) pairs inside the window"""
+    _ensure_warm(supabase)
+    cutoff = datetime.utcnow() - WINDOW
+    with _lock:
+        for key in list(_index):
+            _prune(_index[key], cutoff)
+            if not _index[key]:
+                del _index[key]
+        ranked = sorted(_index.items(), key=lambda item: len(item[1]), reverse=True)[:limit]
+        return [{
+            'category': category,
+            'location': location,
+            'count': len(timestamps)
+        } for (category, location), timestamps in ranked]
@@ -0,0 +1,84 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from flask import request
+
+# Largest page a client may request
+MAX_PAGE_SIZE = 100
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(row):
+    """Opaque cursor pointing just past the given row"""
+    payload = json.dumps({'created_at': row['created_at'], 'id': row['id']})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def parse_timestamp(value):
+    """Return value if it is an ISO 8601 timestamp string, else raise InvalidCursor.
+
+    Cursor values are interpolated into PostgREST filters, so anything else
+    (e.g. extra filter terms) must be rejected.
+    """
+    try:
+        datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise InvalidCursor('Invalid cursor')
+    return value
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        created_at, last_id = payload['created_at'], str(uuid.UUID(payload['id']))
+    except Exception:
+        raise InvalidCursor('Invalid cursor')
+    return parse_timestamp(created_at), last_id
+
+def get_page_args():
+    """Read limit/cursor from the query string.
+
+    Returns (limit, cursor); limit is None when the client did not ask for
+    pagination, so existing callers keep receiving the full list.
+    """
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+
+    if limit is None and cursor is None:
+        return None, None
+
+    try:
+        limit = int(limit) if limit is not None else MAX_PAGE_SIZE
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid limit')
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    return limit, decode_cursor(cursor) if cursor else None
+
+def paginate(query, limit, cursor):
+    """Apply keyset ordering on (created_at, id) newest first and run the query.
+
+    Returns (rows, next_cursor).
+    """
+    query = query.order('created_at', desc=True).order('id', desc=True)
+
+    if limit is None:
+        result = query.execute()
+        return result.data or [], None
+
+    if cursor:
+        created_at, last_id = cursor
+        query = query.or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.lt."{last_id}")'
+        )
+
+    result = query.limit(limit + 1).execute()
+    rows = result.data or []
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+
+    return rows, next_cursor
@@ -0,0 +1,141 @@
+"""Move inline base64 photos out of complaint rows into object storage.
+
+Run from the project root:
+
+    python -m app.photo_migration [--batch-size 20] [--concurrency 4]
+
+Progress is saved after every batch, so an interrupted run resumes where it
+stopped. Complaints that failed are recorded in the state file and retried at
+the start of the next run; pass --restart to scan from the beginning again.
+"""
+import argparse
+import base64
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from app.database import get_supabase_client
+from app.photos import SpooledPhoto, spool_photo_bytes, store_photo, photo_fields
+
+PHOTO_COLUMNS = ['progress_photo_url', 'completion_photo_url']
+
+DEFAULT_STATE_FILE = '.photo_migration_state.json'
+
+def _initial_state():
+    return {'last_id': None, 'migrated': 0, 'failed': 0, 'failed_ids': [], 'bytes_reclaimed': 0}
+
+def _load_state(path):
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return _initial_state()
+    # State files from before failures were recorded by id
+    state.setdefault('failed_ids', [])
+    return state
+
+def _save_state(path, state):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def fetch_batch(supabase, last_id, batch_size):
+    """Next complaints after last_id holding a data: URL in a photo column"""
+    query = supabase.table('complaints').select(f"id, {', '.join(PHOTO_COLUMNS)}").or_(
+        ','.join(f'{column}.like."data:*"' for column in PHOTO_COLUMNS)
+    )
+    if last_id is not None:
+        query = query.gt('id', last_id)
+    result = query.order('id').limit(batch_size).execute()
+    return result.data or []
+
+def fetch_by_ids(supabase, ids):
+    """Complaints with the given ids, for retrying earlier failures"""
+    result = supabase.table('complaints').select(f"id, {', '.join(PHOTO_COLUMNS)}").in_('id', ids).execute()
+    return result.data or []
+
+def migrate_complaint(supabase, complaint, dry_run=False):
+    """Upload each inline photo of one complaint; returns bytes reclaimed"""
+    update_data = {}
+    reclaimed = 0
+
+    for column in PHOTO_COLUMNS:
+        value = complaint.get(column)
+        if not value or not value.startswith('data:'):
+            continue
+        photo_bytes = base64.b64decode(value.split(',', 1)[1])
+        if not dry_run:
+            photo = SpooledPhoto(*spool_photo_bytes(photo_bytes))
+            try:
+                store_photo(supabase, photo)
+            finally:
+                photo.remove_files()
+            update_data.update(photo_fields(photo, column))
+        reclaimed += len(value)
+
+    if update_data:
+        supabase.table('complaints').update(update_data).eq('id', complaint['id']).execute()
+
+    return reclaimed
+
+def run(batch_size=20, concurrency=4, state_file=DEFAULT_STATE_FILE, restart=False, dry_run=False):
+    supabase = get_supabase_client()
+    state = _initial_state() if restart else _load_state(state_file)
+
+    def migrate_batch(batch):
+        """Migrate a batch in parallel; returns the ids that failed"""
+        futures = [(c['id'], executor.submit(migrate_complaint, supabase, c, dry_run)) for c in batch]
+        failed_ids = []
+        for complaint_id, future in futures:
+            try:
+                state['bytes_reclaimed'] += future.result()
+                state['migrated'] += 1
+            except Exception as e:
+                print(f"Failed to migrate photos for complaint {complaint_id}: {e}")
+                failed_ids.append(complaint_id)
+        return failed_ids
+
+    def checkpoint():
+        state['failed'] = len(state['failed_ids'])
+        if not dry_run:
+            _save_state(state_file, state)
+
+        print(f"Migrated {state['migrated']} complaints, {state['failed']} failed, "
+              f"{state['bytes_reclaimed'] / (1024 * 1024):.1f} MB reclaimed")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # The scan has already moved past earlier failures, so retry them by id first
+        retry_ids = list(state['failed_ids'])
+        for start in range(0, len(retry_ids), batch_size):
+            ids = retry_ids[start:start + batch_size]
+            still_failed = set(migrate_batch(fetch_by_ids(supabase, ids)))
+            # Ids that failed again stay recorded; deleted complaints are dropped
+            resolved = set(ids) - still_failed
+            state['failed_ids'] = [i for i in state['failed_ids'] if i not in resolved]
+            checkpoint()
+
+        while True:
+            batch = fetch_batch(supabase, state['last_id'], batch_size)
+            if not batch:
+                break
+
+            state['failed_ids'].extend(migrate_batch(batch))
+            state['last_id'] = batch[-1]['id']
+            checkpoint()
+
+    print('Done' + (' (dry run, nothing written)' if dry_run else ''))
+    return state
+
+def main():
+    parser = argparse.ArgumentParser(description='Move inline base64 complaint photos to object storage')
+    parser.add_argument('--batch-size', type=int, default=20, help='complaints fetched per batch')
+    parser.add_argument('--concurrency', type=int, default=4, help='parallel uploads')
+    parser.add_argument('--state-file', default=DEFAULT_STATE_FILE, help='where progress is saved for resuming')
+    parser.add_argument('--restart', action='store_true', help='ignore saved progress and scan from the start')
+    parser.add_argument('--dry-run', action='store_true', help='report what would be migrated without uploading')
+    args = parser.parse_args()
+
+    run(args.batch_size, args.concurrency, args.state_file, args.restart, args.dry_run)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,382 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import request, jsonify
+from config import Config
+from app.database import get_supabase_client
+
+BUCKET_NAME = 'complaint-photos'
+
+# Objects are stored under the SHA-256 of the uploaded bytes, so re-sending
+# the same photo reuses the existing object instead of uploading again
+CONTENT_FOLDER = 'sha256'
+
+# Bytes read from the request per iteration while spooling to disk
+CHUNK_SIZE = 64 * 1024
+
+# Background uploads: attempts per photo and the first retry delay (doubles)
+UPLOAD_ATTEMPTS = 5
+UPLOAD_BACKOFF_SECONDS = 1
+
+# Stored photos are re-encoded to fit this box, with a small thumbnail beside them
+MAX_DIMENSION = 1600
+JPEG_QUALITY = 80
+THUMBNAIL_DIMENSION = 320
+THUMBNAIL_QUALITY = 70
+
+# Status column tracking a background upload for each photo column
+PHOTO_STATUS_COLUMNS = {
+    'progress_photo_url': 'progress_photo_status',
+    'completion_photo_url': 'completion_photo_status'
+}
+
+# Thumbnail URL column for each photo column
+PHOTO_THUMBNAIL_COLUMNS = {
+    'progress_photo_url': 'progress_thumbnail_url',
+    'completion_photo_url': 'completion_thumbnail_url'
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_upload_slots = threading.BoundedSemaphore(Config.PHOTO_UPLOAD_QUEUE_SIZE)
+
+class PhotoError(ValueError):
+    status_code = 400
+
+class PhotoTooLarge(PhotoError):
+    status_code = 413
+
+class SpooledPhoto:
+    """Photo spooled to local disk; url is set once it has been stored"""
+    def __init__(self, path, digest, content_type='image/jpeg'):
+        self.path = path
+        self.digest = digest
+        self.file_name = f"{CONTENT_FOLDER}/{digest}.jpg"
+        self.thumbnail_name = f"{CONTENT_FOLDER}/{digest}_thumb.jpg"
+        self.content_type = content_type
+        self.checked_existing = False
+        self.processed = False
+        self.thumbnail_path = None
+        self.url = None
+        self.thumbnail_url = None
+
+    @property
+    def entry_path(self):
+        """JSON file beside a queued photo naming its complaint and column"""
+        return self.path[:-len('.jpg')] + '.json'
+
+    def remove_files(self):
+        for path in (self.path, self.thumbnail_path, self.entry_path):
+            if path and os.path.exists(path):
+                os.remove(path)
+
+def discard_photo(photo):
+    """Remove the spooled files of a photo that will not be uploaded"""
+    if isinstance(photo, SpooledPhoto):
+        photo.remove_files()
+
+def _spool_dir():
+    os.makedirs(Config.PHOTO_SPOOL_DIR, exist_ok=True)
+    return Config.PHOTO_SPOOL_DIR
+
+def spool_photo_bytes(photo_bytes):
+    """Write decoded photo bytes to the spool; returns (path, digest)"""
+    fd, path = tempfile.mkstemp(prefix='photo_', suffix='.jpg', dir=_spool_dir())
+    with os.fdopen(fd, 'wb') as spool:
+        spool.write(photo_bytes)
+    return path, hashlib.sha256(photo_bytes).hexdigest()
+
+def _content_type(mimetype):
+    return mimetype if mimetype and mimetype.startswith('image/') else 'image/jpeg'
+
+def spool_request_photo():
+    """Copy a multipart 'photo' field or a raw image body to a temp file in chunks.
+
+    Returns (path, content_type, digest), hashing while copying. Memory use
+    stays at one chunk regardless of photo size; the caller must remove
+    the file.
+    """
+    if request.mimetype == 'multipart/form-data':
+        photo = request.files.get('photo')
+        if not photo:
+            raise PhotoError('No photo provided')
+        source, content_type = photo.stream, _content_type(photo.mimetype)
+    else:
+        source, content_type = request.stream, _content_type(request.mimetype)
+
+    fd, path = tempfile.mkstemp(prefix='photo_', suffix='.jpg', dir=_spool_dir())
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as spool:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > Config.MAX_PHOTO_BYTES:
+                    raise PhotoTooLarge('Photo is too large')
+                spool.write(chunk)
+                digest.update(chunk)
+        if size == 0:
+            raise PhotoError('No photo provided')
+    except Exception:
+        os.remove(path)
+        raise
+
+    return path, content_type, digest.hexdigest()
+
+def upload_photo_file(supabase, file_name, path, content_type='image/jpeg'):
+    """Upload a spooled photo from disk and return its public URL"""
+    bucket = supabase.storage.from_(BUCKET_NAME)
+    try:
+        with open(path, 'rb') as photo_file:
+            bucket.upload(file_name, photo_file, {
+                "content-type": content_type
+            })
+    except Exception as e:
+        # Content-addressed: a concurrent upload of the same bytes already won
+        if 'Duplicate' not in str(e) and 'already exists' not in str(e):
+            raise
+    return bucket.get_public_url(file_name)
+
+def _find_stored_photo(supabase, photo):
+    """Reuse URLs for a photo whose content is already in the bucket"""
+    bucket = supabase.storage.from_(BUCKET_NAME)
+    existing = bucket.list(CONTENT_FOLDER, {'search': photo.digest, 'limit': 2})
+    names = {f"{CONTENT_FOLDER}/{item['name']}" for item in (existing or [])}
+
+    if photo.file_name in names:
+        photo.url = bucket.get_public_url(photo.file_name)
+        # The stored object is already processed, so skip re-encoding
+        photo.processed = True
+        if photo.thumbnail_name in names:
+            photo.thumbnail_url = bucket.get_public_url(photo.thumbnail_name)
+
+def process_photo(photo):
+    """Re-encode a spooled photo in place and write its thumbnail.
+
+    The photo is rotated upright, bounded to MAX_DIMENSION and saved as JPEG
+    without EXIF. Returns the thumbnail path, or None if Pillow is missing
+    or the file is not an image (the original is then stored untouched).
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return None
+
+    thumbnail_path = photo.path[:-len('.jpg')] + '_thumb.jpg'
+    try:
+        with Image.open(photo.path) as image:
+            image = ImageOps.exif_transpose(image).convert('RGB')
+            image.thumbnail((MAX_DIMENSION, MAX_DIMENSION))
+            image.save(photo.path, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+            image.thumbnail((THUMBNAIL_DIMENSION, THUMBNAIL_DIMENSION))
+            image.save(thumbnail_path, 'JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+    except Exception as e:
+        print(f"Warning: Could not process photo, storing original: {e}")
+        return None
+
+    photo.content_type = 'image/jpeg'
+    return thumbnail_path
+
+def store_photo(supabase, photo):
+    """Process and upload a spooled photo and its thumbnail.
+
+    Steps already done are skipped, so a failed call can simply be retried.
+    """
+    if not photo.checked_existing:
+        _find_stored_photo(supabase, photo)
+        photo.checked_existing = True
+    if not photo.processed:
+        photo.thumbnail_path = process_photo(photo)
+        photo.processed = True
+    if photo.url is None:
+        photo.url = upload_photo_file(supabase, photo.file_name, photo.path, photo.content_type)
+    if photo.thumbnail_path and photo.thumbnail_url is None:
+        photo.thumbnail_url = upload_photo_file(supabase, photo.thumbnail_name, photo.thumbnail_path)
+    photo.remove_files()
+    return photo
+
+def save_request_photo(supabase, data=None):
+    """Store the photo sent with this request.
+
+    data is the parsed JSON body for the legacy base64 endpoints; otherwise
+    the photo is streamed from a multipart or raw image body. Returns a
+    SpooledPhoto (still pending when uploads run in the background), or the
+    raw data URL if a legacy upload could not be stored.
+    """
+    if data is not None:
+        photo_data = data['photo'].split(',')[1] if ',' in data['photo'] else data['photo']
+        # Check the decoded size before decoding (4 base64 chars per 3 bytes)
+        if len(photo_data) * 3 // 4 > Config.MAX_PHOTO_BYTES:
+            raise PhotoTooLarge('Photo is too large')
+        
+        photo = None
+        try:
+            photo = SpooledPhoto(*spool_photo_bytes(base64.b64decode(photo_data)))
+            if Config.PHOTO_UPLOAD_ASYNC:
+                return photo
+            return store_photo(supabase, photo)
+        except Exception as storage_error:
+            # If storage fails, store base64 directly in database
+            print(f"Storage upload failed, using base64: {storage_error}")
+            if photo:
+                photo.remove_files()
+            return data['photo']
+
+    path, content_type, digest = spool_request_photo()
+    photo = SpooledPhoto(path, digest, content_type)
+    if Config.PHOTO_UPLOAD_ASYNC:
+        return photo
+    try:
+        return store_photo(supabase, photo)
+    except Exception:
+        photo.remove_files()
+        raise
+
+def photo_fields(photo, column):
+    """Complaint fields recording a stored, pending or inline (base64 fallback) photo"""
+    status_column = PHOTO_STATUS_COLUMNS[column]
+    if not isinstance(photo, SpooledPhoto):
+        return {column: photo, status_column: 'inline'}
+    if photo.url is None:
+        return {column: None, status_column: 'pending'}
+    fields = {column: photo.url, status_column: 'uploaded'}
+    if photo.thumbnail_url:
+        fields[PHOTO_THUMBNAIL_COLUMNS[column]] = photo.thumbnail_url
+    return fields
+
+def init_app(app):
+    """Reject oversized bodies before Werkzeug buffers or parses them"""
+    # Room for a base64-encoded photo plus the rest of a JSON or multipart body
+    app.config['MAX_CONTENT_LENGTH'] = Config.MAX_PHOTO_BYTES * 4 // 3 + 64 * 1024
+    
+    @app.errorhandler(413)
+    def request_too_large(e):
+        return jsonify({'error': 'Photo is too large'}), 413
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=Config.PHOTO_UPLOAD_WORKERS,
+                                           thread_name_prefix='photo-upload')
+        return _executor
+
+def _write_spool_entry(photo, complaint_id, column, failed=False):
+    """Record which upload a spooled photo belongs to, so another process can finish it"""
+    entry = {
+        'complaint_id': complaint_id,
+        'column': column,
+        'digest': photo.digest,
+        'content_type': photo.content_type,
+        'pid': os.getpid(),
+        'failed': failed
+    }
+    tmp_path = f'{photo.entry_path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, photo.entry_path)
+
+def queue_photo_upload(photo, complaint_id, column):
+    """Upload a pending photo in the background once the row marks it pending"""
+    if not isinstance(photo, SpooledPhoto) or photo.url is not None:
+        return
+    _write_spool_entry(photo, complaint_id, column)
+    if _upload_slots.acquire(blocking=False):
+        _get_executor().submit(_upload_job, photo, complaint_id, column, True)
+    else:
+        # Queue is full: upload in the request thread instead
+        _upload_job(photo, complaint_id, column, False)
+
+def _upload_job(photo, complaint_id, column, holds_slot):
+    supabase = get_supabase_client()
+    status_column = PHOTO_STATUS_COLUMNS[column]
+    try:
+        for attempt in range(UPLOAD_ATTEMPTS):
+            try:
+                store_photo(supabase, photo)
+                update_data = photo_fields(photo, column)
+                update_data[status_column] = 'uploaded'
+                supabase.table('complaints').update(update_data).eq('id', complaint_id).execute()
+                return
+            except Exception as e:
+                print(f"Photo upload for complaint {complaint_id} failed (attempt {attempt + 1}): {e}")
+                if attempt + 1 < UPLOAD_ATTEMPTS:
+                    time.sleep(UPLOAD_BACKOFF_SECONDS * 2 ** attempt)
+        
+        # Keep the spooled file; recover_spooled_uploads retries it on the next start
+        print(f"Giving up on photo upload for complaint {complaint_id}; kept at {photo.path}")
+        try:
+            _write_spool_entry(photo, complaint_id, column, failed=True)
+        except OSError as e:
+            print(f"Warning: Could not record failed photo upload: {e}")
+        try:
+            supabase.table('complaints').update({status_column: 'failed'}).eq('id', complaint_id).execute()
+        except Exception as e:
+            print(f"Warning: Could not mark photo upload failed: {e}")
+    finally:
+        if holds_slot:
+            _upload_slots.release()
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def recover_spooled_uploads():
+    """Re-queue uploads left in the spool by a process that exited or gave up.
+
+    Uploads still owned by a running process are left alone. Each entry is
+    claimed by renaming it first, so processes starting together do not
+    upload the same photo twice. Returns the number of uploads queued.
+    """
+    if not os.path.isdir(Config.PHOTO_SPOOL_DIR):
+        return 0
+
+    recovered = 0
+    for name in sorted(os.listdir(Config.PHOTO_SPOOL_DIR)):
+        if not name.endswith('.json'):
+            continue
+        entry_path = os.path.join(Config.PHOTO_SPOOL_DIR, name)
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if entry['pid'] == os.getpid() or (not entry.get('failed') and _process_alive(entry['pid'])):
+            continue
+
+        # The rest waits for the next start rather than blocking this one
+        if not _upload_slots.acquire(blocking=False):
+            break
+        claimed_path = f'{entry_path}.{os.getpid()}'
+        try:
+            os.rename(entry_path, claimed_path)
+        except OSError:
+            _upload_slots.release()
+            continue
+
+        photo = SpooledPhoto(entry_path[:-len('.json')] + '.jpg', entry['digest'], entry['content_type'])
+        if not os.path.exists(photo.path):
+            os.remove(claimed_path)
+            _upload_slots.release()
+            continue
+        _write_spool_entry(photo, entry['complaint_id'], entry['column'])
+        os.remove(claimed_path)
+        _get_executor().submit(_upload_job, photo, entry['complaint_id'], entry['column'], True)
+        recovered += 1
+
+    if recovered:
+        print(f"Re-queued {recovered} spooled photo uploads")
+    return recovered
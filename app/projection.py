@@ -0,0 +1,70 @@
+from flask import request
+
+# Complaint columns a client may ask for with ?fields=
+COMPLAINT_FIELDS = {
+    'id', 'user_id', 'title', 'description', 'category', 'location',
+    'status', 'priority', 'is_emergency', 'image_url', 'upvote_count',
+    'assigned_to', 'validated_by', 'validated_at', 'verified_by',
+    'verification_notes', 'escalated_to', 'escalated_at', 'worker_rating',
+    'rated_by', 'rated_at', 'worker_notes', 'progress_photo_url',
+    'completion_photo_url', 'progress_photo_status', 'completion_photo_status',
+    'progress_thumbnail_url', 'completion_thumbnail_url', 'completed_at',
+    'completion_notes', 'proof_of_work', 'resolved_by', 'resolved_at',
+    'resolution_notes', 'created_at', 'updated_at'
+}
+
+# Default projection for list views: what the dashboards render, without
+# audit columns and free-text notes
+COMPLAINT_LIST_FIELDS = [
+    'id', 'user_id', 'title', 'description', 'category', 'location',
+    'status', 'priority', 'is_emergency', 'image_url', 'upvote_count',
+    'assigned_to', 'worker_rating', 'rated_at', 'progress_photo_url',
+    'completion_photo_url', 'progress_thumbnail_url', 'completion_thumbnail_url',
+    'completed_at', 'resolved_at', 'created_at', 'updated_at'
+]
+
+# Photo columns that may still hold legacy inline base64 images (see
+# app/photo_migration.py); list views never send those
+INLINE_PHOTO_COLUMNS = ['progress_photo_url', 'completion_photo_url']
+
+class InvalidFields(ValueError):
+    pass
+
+def get_fields(default, required=('id', 'created_at')):
+    """Build the select() column list from ?fields=, falling back to default.
+
+    Only known complaint columns are accepted so clients cannot embed other
+    tables. Columns in required are always included (e.g. for cursors).
+    """
+    requested = request.args.get('fields')
+
+    if not requested:
+        if default == '*':
+            return '*'
+        fields = list(default)
+    else:
+        fields = [f.strip() for f in requested.split(',') if f.strip()]
+        unknown = [f for f in fields if f not in COMPLAINT_FIELDS]
+        if unknown:
+            raise InvalidFields(f'Unknown fields: {", ".join(unknown)}')
+
+    for field in required:
+        if field not in fields:
+            fields.append(field)
+
+    return ', '.join(fields)
+
+def redact_inline_photos(rows):
+    """Blank inline data: photos in list rows, flagging them as has_*_photo.
+
+    The full image stays available from GET /api/complaints/<id>.
+    """
+    for row in rows:
+        for column in INLINE_PHOTO_COLUMNS:
+            if column not in row:
+                continue
+            value = row[column]
+            row['has_' + column[:-len('_url')]] = bool(value)
+            if value and value.startswith('data:'):
+                row[column] = None
+    return rows
@@ -0,0 +1,100 @@
+import gzip
+from datetime import date, datetime, timezone
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+from config import Config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Dynamic responses favour speed over ratio
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/plain', 'text/html'}
+
+def _default(o):
+    """Encode datetimes as ISO 8601 (naive values are UTC, as from utcnow())"""
+    if isinstance(o, datetime):
+        return (o if o.tzinfo else o.replace(tzinfo=timezone.utc)).isoformat()
+    if isinstance(o, date):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson when installed, else the json module.
+
+    Both paths write datetimes as ISO 8601 rather than Flask's RFC 822 dates,
+    and neither sorts keys.
+    """
+    default = staticmethod(_default)
+    ensure_ascii = False
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Pretty-printed debug output keeps going through the json module
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def _choose_encoding():
+    """Best encoding the client accepts: brotli if available, else gzip"""
+    accepted = request.accept_encodings
+    gzip_quality = accepted.quality('gzip')
+    if brotli is not None and accepted.quality('br') and accepted.quality('br') >= gzip_quality:
+        return 'br'
+    if gzip_quality:
+        return 'gzip'
+    return None
+
+def compress_response(response):
+    """Compress buffered text responses above COMPRESS_MIN_BYTES"""
+    if (not Config.COMPRESS_RESPONSES or response.status_code != 200
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < Config.COMPRESS_MIN_BYTES:
+        return response
+    
+    encoding = _choose_encoding()
+    if encoding == 'br':
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    elif encoding == 'gzip':
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+    else:
+        return response
+    
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+def init_app(app):
+    """Install the fast JSON provider and response compression on an app"""
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
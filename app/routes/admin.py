@@ -1,7 +1,18 @@
-from flask import Blueprint, request, jsonify
-from datetime import datetime, timedelta
+from flask import Blueprint, Response, request, jsonify
+from datetime import datetime
+from config import Config
 from app.database import get_supabase_client
-from app.auth_middleware import token_required, role_required
+from app.auth_middleware import token_required, role_required, issue_stream_token, STREAM_TOKEN_TTL_SECONDS
+from app.user_loader import attach_student_info, load_users
+from app import events, hotspots
+from app.classifier import reclassify_complaints
+from app.conditional import VALIDATOR_COLUMNS, scope_validator, list_etag, not_modified_response, with_etag
+from app.fanout import fan_out
+from app.escalation import escalate_overdue_complaints, escalate_unassigned_complaints, get_status as get_escalation_status
+from app.stats import get_complaint_stats, count_complaints, get_worker_task_counts
+from app.pagination import get_page_args, paginate, InvalidCursor
+from app.sync import get_since, fetch_changes, latest_cursor
+from app.projection import get_fields, redact_inline_photos, InvalidFields, COMPLAINT_LIST_FIELDS
 
 bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 
@@ -24,85 +35,106 @@ def log_complaint_action(supabase, complaint_id, action, performed_by, from_stat
 
 def check_complaint_frequency(supabase, category, location):
     """Check frequency of similar complaints"""
-    # Get complaints from last 7 days with same category and location
-    seven_days_ago = (datetime.utcnow() - timedelta(days=7)).isoformat()
-    result = supabase.table('complaints').select('id').eq('category', category).eq('location', location).gte('created_at', seven_days_ago).execute()
-    return len(result.data) if result.data else 0
+    # Complaints from last 7 days with same category and location, from the in-memory index
+    return hotspots.count(supabase, category, location)
 
 @bp.route('/complaints', methods=['GET'])
 @token_required
 @role_required(['admin'])
 def get_all_complaints():
+    try:
+        limit, cursor = get_page_args()
+        since = get_since()
+        fields = get_fields(COMPLAINT_LIST_FIELDS, required=('id', 'created_at', 'user_id'))
+    except (InvalidCursor, InvalidFields) as e:
+        return jsonify({'error': str(e)}), 400
+    
     supabase = get_supabase_client()
     
-    # Get user's admin role - workaround for schema cache issue
-    user = supabase.table('users').select('name').eq('id', request.user['user_id']).execute()
-    user_name = user.data[0]['name'] if user.data else ''
-    
-    # Determine admin_role from name (temporary workaround)
-    admin_role = None
-    if 'Validator' in user_name:
-        admin_role = 'validator'
-    elif 'Supervisor' in user_name:
-        admin_role = 'supervisor'
-    elif 'Warden' in user_name:
-        admin_role = 'warden'
-    elif 'Dean' in user_name:
-        admin_role = 'dean'
+    # Admin sub-role is resolved once by token_required
+    admin_role = request.user.get('admin_role')
     
     # Filter options
     status = request.args.get('status')
     category = request.args.get('category')
     priority = request.args.get('priority')
     
-    # Get ALL emergency complaints (both active and resolved) - visible to all admins
-    emergency_query = supabase.table('complaints').select('*').eq('is_emergency', True)
-    emergency_result = emergency_query.order('created_at', desc=True).execute()
-    emergency_complaints = emergency_result.data if emergency_result.data else []
-    
-    # Get regular complaints based on role
-    query = supabase.table('complaints').select('*').eq('is_emergency', False)
+    def emergency_scope(columns, table='complaints', **kwargs):
+        return supabase.table(table).select(columns, **kwargs).eq('is_emergency', True)
     
-    # Role-based filtering for non-emergency complaints
-    if admin_role == 'validator':
-        # Validators see pending complaints
-        query = query.eq('status', 'pending')
-    elif admin_role == 'supervisor':
-        # Supervisors see validated and assigned complaints
-        query = query.in_('status', ['validated', 'assigned'])
-    elif admin_role in ['dean', 'warden']:
-        # Deans and wardens see escalated complaints
-        if not status:
-            query = query.eq('status', 'escalated')
+    def regular_scope(columns, table='complaints', **kwargs):
+        query = supabase.table(table).select(columns, **kwargs).eq('is_emergency', False)
+        
+        # Role-based filtering for non-emergency complaints
+        if admin_role == 'validator':
+            # Validators see pending complaints
+            query = query.eq('status', 'pending')
+        elif admin_role == 'supervisor':
+            # Supervisors see validated and assigned complaints
+            query = query.in_('status', ['validated', 'assigned'])
+        elif admin_role in ['dean', 'warden']:
+            # Deans and wardens see escalated complaints
+            if not status:
+                query = query.eq('status', 'escalated')
+        
+        if status:
+            query = query.eq('status', status)
+        if category:
+            query = query.eq('category', category)
+        if priority:
+            query = query.eq('priority', priority)
+        return query
+    
+    # Answer repeat loads from the client's cached copy when neither the
+    # emergencies nor the caller's regular complaints changed
+    validators = fan_out(
+        lambda: scope_validator(regular_scope(VALIDATOR_COLUMNS, count='exact')),
+        lambda: scope_validator(emergency_scope(VALIDATOR_COLUMNS, count='exact'))
+    )
+    etag = list_etag(*validators)
+    cached = not_modified_response(etag)
+    if cached:
+        return cached
+    
+    if since:
+        # Delta sync: complaints changed since the client's last load, plus
+        # ids that moved out of this admin's queue or were deleted
+        changed, removed, sync_cursor = fetch_changes(
+            since,
+            [emergency_scope, regular_scope],
+            fields,
+            supabase.table('complaint_tombstones').select('complaint_id, deleted_at')
+        )
+        attach_student_info(supabase, changed)
+        return with_etag(jsonify({
+            'complaints': redact_inline_photos(changed),
+            'removed': removed,
+            'admin_role': admin_role,
+            'sync_cursor': sync_cursor
+        }), etag), 200
     
-    if status:
-        query = query.eq('status', status)
-    if category:
-        query = query.eq('category', category)
-    if priority:
-        query = query.eq('priority', priority)
+    # Get ALL emergency complaints (both active and resolved) - visible to all admins
+    # They are only prepended to the first page when paginating
+    emergency_complaints = []
+    if not cursor:
+        emergency_result = emergency_scope(fields).order('created_at', desc=True).execute()
+        emergency_complaints = emergency_result.data if emergency_result.data else []
     
-    result = query.order('created_at', desc=True).execute()
-    regular_complaints = result.data if result.data else []
+    # Get regular complaints based on role
+    regular_complaints, next_cursor = paginate(regular_scope(fields), limit, cursor)
     
     # Combine: emergencies first, then regular complaints
     all_complaints = emergency_complaints + regular_complaints
     
     # Add student information to each complaint
-    for complaint in all_complaints:
-        if complaint.get('user_id'):
-            try:
-                user_info = supabase.table('users').select('name, student_id, email').eq('id', complaint['user_id']).execute()
-                if user_info.data:
-                    complaint['student_name'] = user_info.data[0].get('name', 'Unknown')
-                    complaint['student_id'] = user_info.data[0].get('student_id', 'N/A')
-                    complaint['student_email'] = user_info.data[0].get('email', 'N/A')
-            except Exception as e:
-                print(f"Error fetching user info: {e}")
-                complaint['student_name'] = 'Unknown'
-                complaint['student_id'] = 'N/A'
-    
-    return jsonify({'complaints': all_complaints, 'admin_role': admin_role}), 200
+    attach_student_info(supabase, all_complaints)
+    
+    return with_etag(jsonify({
+        'complaints': redact_inline_photos(all_complaints),
+        'admin_role': admin_role,
+        'next_cursor': next_cursor,
+        'sync_cursor': latest_cursor(None, *[v[1] for v in validators])
+    }), etag), 200
 
 @bp.route('/complaints/<complaint_id>/validate', methods=['POST'])
 @token_required
@@ -112,10 +144,8 @@ def validate_complaint(complaint_id):
     data = request.get_json()
     supabase = get_supabase_client()
     
-    # Check user is validator - workaround for schema cache issue
-    user = supabase.table('users').select('name').eq('id', request.user['user_id']).execute()
-    user_name = user.data[0]['name'] if user.data else ''
-    if 'Validator' not in user_name:
+    # Check user is validator
+    if request.user.get('admin_role') != 'validator':
         return jsonify({'error': 'Only validators can validate complaints'}), 403
     
     # Get complaint
@@ -166,10 +196,8 @@ def assign_complaint(complaint_id):
     data = request.get_json()
     supabase = get_supabase_client()
     
-    # Check user is supervisor - workaround for schema cache issue
-    user = supabase.table('users').select('name').eq('id', request.user['user_id']).execute()
-    user_name = user.data[0]['name'] if user.data else ''
-    if 'Supervisor' not in user_name:
+    # Check user is supervisor
+    if request.user.get('admin_role') != 'supervisor':
         return jsonify({'error': 'Only supervisors can assign complaints'}), 403
     
     if 'worker_id' not in data:
@@ -247,16 +275,8 @@ def get_workers():
 def get_stats():
     supabase = get_supabase_client()
     
-    # Get complaint statistics
-    all_complaints = supabase.table('complaints').select('status, priority').execute()
-    
-    stats = {
-        'total': len(all_complaints.data),
-        'pending': len([c for c in all_complaints.data if c['status'] == 'pending']),
-        'in_progress': len([c for c in all_complaints.data if c['status'] == 'in_progress']),
-        'resolved': len([c for c in all_complaints.data if c['status'] == 'resolved']),
-        'high_priority': len([c for c in all_complaints.data if c['priority'] == 'high'])
-    }
+    # Counts are aggregated by the database
+    stats = get_complaint_stats(supabase)
     
     return jsonify({'stats': stats}), 200
 
@@ -266,30 +286,17 @@ def get_stats():
 @role_required(['admin'])
 def check_escalations():
     """Check and escalate overdue complaints (run periodically)"""
-    supabase = get_supabase_client()
+    # When the background scheduler is running, just report its last sweep
+    status = get_escalation_status()
+    if status:
+        return jsonify({
+            'message': f"Scheduler escalated {status.get('overdue_escalated', 0)} complaints in last run",
+            'count': status.get('overdue_escalated', 0),
+            'scheduler': status
+        }), 200
     
-    # Get complaints past deadline
-    now = datetime.utcnow().isoformat()
-    overdue = supabase.table('complaints').select('*').in_('status', ['assigned', 'in_progress']).lt('deadline', now).execute()
-    
-    escalated_count = 0
-    for complaint in overdue.data:
-        # Escalate to warden
-        update_data = {
-            'status': 'escalated',
-            'escalated_to': 'warden',
-            'escalated_at': datetime.utcnow().isoformat(),
-            'updated_at': datetime.utcnow().isoformat()
-        }
-        
-        supabase.table('complaints').update(update_data).eq('id', complaint['id']).execute()
-        
-        # Log escalation
-        log_complaint_action(supabase, complaint['id'], 'escalated', None,
-                            complaint['status'], 'escalated',
-                            'Automatically escalated due to missed deadline')
-        
-        escalated_count += 1
+    supabase = get_supabase_client()
+    escalated_count = len(escalate_overdue_complaints(supabase))
     
     return jsonify({'message': f'Escalated {escalated_count} complaints', 'count': escalated_count}), 200
 
@@ -298,64 +305,20 @@ def check_escalations():
 @role_required(['admin'])
 def check_unassigned_complaints():
     """Check for validated complaints not assigned within 2 minutes and escalate to warden (TESTING: 2 minutes instead of 2 days)"""
+    # When the background scheduler is running, just report its last sweep
+    status = get_escalation_status()
+    if status:
+        return jsonify({
+            'message': f"Scheduler escalated {status.get('unassigned_escalated', 0)} unassigned complaints in last run",
+            'count': status.get('unassigned_escalated', 0),
+            'complaints': [],
+            'scheduler': status
+        }), 200
+    
     supabase = get_supabase_client()
     
-    # Calculate the cutoff time (2 minutes ago for testing - change to days=2 for production)
-    two_minutes_ago = (datetime.utcnow() - timedelta(minutes=2)).isoformat()
-    
-    # Get validated complaints older than 2 minutes that haven't been escalated
-    unassigned = supabase.table('complaints').select('*').eq('status', 'validated').lt('validated_at', two_minutes_ago).is_('escalated_at', 'null').execute()
-    
-    escalated_count = 0
-    escalated_complaints = []
-    
-    for complaint in (unassigned.data or []):
-        # Skip if already escalated
-        if complaint.get('escalated_at'):
-            continue
-            
-        # Escalate to warden
-        update_data = {
-            'status': 'escalated',
-            'escalated_to': 'warden',
-            'escalated_at': datetime.utcnow().isoformat(),
-            'updated_at': datetime.utcnow().isoformat()
-        }
-        
-        result = supabase.table('complaints').update(update_data).eq('id', complaint['id']).execute()
-        
-        # Log escalation
-        log_complaint_action(
-            supabase, 
-            complaint['id'], 
-            'auto_escalated_unassigned', 
-            None,
-            'validated', 
-            'escalated',
-            'Automatically escalated to warden - not assigned within 2 minutes (TESTING MODE)'
-        )
-        
-        # Create notification for warden
-        # Get wardens
-        wardens = supabase.table('users').select('id').eq('role', 'admin').execute()
-        for warden in (wardens.data or []):
-            warden_user = supabase.table('users').select('name').eq('id', warden['id']).execute()
-            if warden_user.data and 'Warden' in warden_user.data[0].get('name', ''):
-                notification_data = {
-                    'user_id': warden['id'],
-                    'complaint_id': complaint['id'],
-                    'message': f'Complaint "{complaint["title"]}" escalated - not assigned within 2 minutes (TESTING)',
-                    'is_read': False,
-                    'created_at': datetime.utcnow().isoformat()
-                }
-                supabase.table('notifications').insert(notification_data).execute()
-        
-        escalated_count += 1
-        escalated_complaints.append({
-            'id': complaint['id'],
-            'title': complaint['title'],
-            'validated_at': complaint.get('validated_at')
-        })
+    escalated_complaints = escalate_unassigned_complaints(supabase)
+    escalated_count = len(escalated_complaints)
     
     return jsonify({
         'message': f'Escalated {escalated_count} unassigned complaints to warden',
@@ -363,6 +326,23 @@ def check_unassigned_complaints():
         'complaints': escalated_complaints
     }), 200
 
+@bp.route('/complaints/reclassify', methods=['POST'])
+@token_required
+@role_required(['admin'])
+def reclassify_pending_complaints():
+    """Re-run emergency keyword detection over pending complaints"""
+    data = request.get_json(silent=True) or {}
+    supabase = get_supabase_client()
+    
+    changed = reclassify_complaints(supabase, dry_run=bool(data.get('dry_run')))
+    
+    return jsonify({
+        'message': f"Flagged {len(changed['flagged'])} and cleared {len(changed['cleared'])} complaints",
+        'flagged': changed['flagged'],
+        'cleared': changed['cleared'],
+        'dry_run': bool(data.get('dry_run'))
+    }), 200
+
 @bp.route('/complaints/<complaint_id>/escalate', methods=['POST'])
 @token_required
 @role_required(['admin'])
@@ -409,6 +389,20 @@ def get_complaint_history(complaint_id):
     
     return jsonify({'history': result.data}), 200
 
+@bp.route('/hotspots', methods=['GET'])
+@token_required
+@role_required(['admin'])
+def get_hotspots():
+    """Most frequent category/location pairs over the last 7 days"""
+    supabase = get_supabase_client()
+    
+    try:
+        limit = int(request.args.get('limit', 10))
+    except (ValueError, TypeError):
+        limit = 10
+    
+    return jsonify({'hotspots': hotspots.top(supabase, max(1, min(limit, 100)))}), 200
+
 @bp.route('/dashboard', methods=['GET'])
 @token_required
 @role_required(['admin'])
@@ -416,41 +410,29 @@ def admin_dashboard():
     """Get dashboard stats based on admin role"""
     supabase = get_supabase_client()
     
-    # Get user's admin role - workaround for schema cache issue
-    user = supabase.table('users').select('name').eq('id', request.user['user_id']).execute()
-    user_name = user.data[0]['name'] if user.data else ''
-    
-    # Determine admin_role from name (temporary workaround)
-    admin_role = None
-    if 'Validator' in user_name:
-        admin_role = 'validator'
-    elif 'Supervisor' in user_name:
-        admin_role = 'supervisor'
-    elif 'Warden' in user_name:
-        admin_role = 'warden'
-    elif 'Dean' in user_name:
-        admin_role = 'dean'
+    # Admin sub-role is resolved once by token_required
+    admin_role = request.user.get('admin_role')
     
     stats = {}
     
     if admin_role == 'validator':
-        pending = supabase.table('complaints').select('id').eq('status', 'pending').execute()
         stats = {
-            'pending_validation': len(pending.data) if pending.data else 0,
+            'pending_validation': count_complaints(supabase, status='pending'),
             'role': 'validator'
         }
     elif admin_role == 'supervisor':
-        in_progress = supabase.table('complaints').select('id').eq('status', 'in_progress').execute()
-        assigned = supabase.table('complaints').select('id').eq('status', 'assigned').execute()
+        pending_assignment, assigned = fan_out(
+            lambda: count_complaints(supabase, status='in_progress'),
+            lambda: count_complaints(supabase, status='assigned')
+        )
         stats = {
-            'pending_assignment': len(in_progress.data) if in_progress.data else 0,
-            'assigned': len(assigned.data) if assigned.data else 0,
+            'pending_assignment': pending_assignment,
+            'assigned': assigned,
             'role': 'supervisor'
         }
     elif admin_role in ['dean', 'warden']:
-        escalated = supabase.table('complaints').select('id').eq('status', 'escalated').execute()
         stats = {
-            'escalated_complaints': len(escalated.data) if escalated.data else 0,
+            'escalated_complaints': count_complaints(supabase, status='escalated'),
             'role': admin_role
         }
     
@@ -463,22 +445,21 @@ def get_worker_performance():
     """Get all workers with their ratings and performance metrics"""
     supabase = get_supabase_client()
     
-    # Get all workers with their stats
-    workers = supabase.table('users').select('*').eq('role', 'worker').order('average_rating', desc=True).execute()
+    # Get all workers with their five most recent ratings (limited per worker),
+    # and their task counts grouped by status in the database
+    workers, task_counts = fan_out(
+        lambda: supabase.table('users').select(
+            '*, recent_ratings:worker_ratings!worker_id(*)'
+        ).eq('role', 'worker').order('average_rating', desc=True)
+            .order('created_at', desc=True, foreign_table='recent_ratings')
+            .limit(5, foreign_table='recent_ratings')
+            .execute(),
+        lambda: get_worker_task_counts(supabase)
+    )
     
     worker_data = []
-    for worker in workers.data:
-        # Get assigned tasks
-        assigned = supabase.table('complaints').select('id').eq('assigned_to', worker['id']).execute()
-        
-        # Get completed tasks
-        completed = supabase.table('complaints').select('id').eq('assigned_to', worker['id']).eq('status', 'completed').execute()
-        
-        # Get in progress tasks
-        in_progress = supabase.table('complaints').select('id').eq('assigned_to', worker['id']).eq('status', 'in_progress').execute()
-        
-        # Get recent ratings
-        recent_ratings = supabase.table('worker_ratings').select('*').eq('worker_id', worker['id']).order('created_at', desc=True).limit(5).execute()
+    for worker in (workers.data or []):
+        tasks = task_counts.get(worker['id'], {})
         
         worker_data.append({
             'id': worker['id'],
@@ -488,9 +469,9 @@ def get_worker_performance():
             'average_rating': worker.get('average_rating', 0),
             'total_ratings': worker.get('total_ratings', 0),
             'completed_tasks': worker.get('completed_tasks', 0),
-            'assigned_tasks': len(assigned.data) if assigned.data else 0,
-            'in_progress_tasks': len(in_progress.data) if in_progress.data else 0,
-            'recent_ratings': recent_ratings.data if recent_ratings.data else []
+            'assigned_tasks': sum(tasks.values()),
+            'in_progress_tasks': tasks.get('in_progress', 0),
+            'recent_ratings': worker.get('recent_ratings') or []
         })
     
     return jsonify({'workers': worker_data}), 200
@@ -522,7 +503,7 @@ def get_worker_details(worker_id):
     return jsonify({
         'worker': worker.data[0],
         'ratings': ratings.data,
-        'tasks': tasks.data,
+        'tasks': redact_inline_photos(tasks.data),
         'stats': {
             'total_assigned': len(tasks.data),
             'completed': len(completed_tasks),
@@ -538,19 +519,9 @@ def get_emergency_complaints():
     """Get emergency complaints for warden or validator"""
     supabase = get_supabase_client()
     
-    # Get user's admin role
-    user = supabase.table('users').select('name, hostel').eq('id', request.user['user_id']).execute()
-    user_name = user.data[0]['name'] if user.data else ''
-    user_hostel = user.data[0].get('hostel') if user.data else None
-    
-    # Determine admin_role from name
-    admin_role = None
-    if 'Validator' in user_name:
-        admin_role = 'validator'
-    elif 'Warden' in user_name:
-        admin_role = 'warden'
-    elif 'Dean' in user_name:
-        admin_role = 'dean'
+    # Admin sub-role and hostel are resolved once by token_required
+    admin_role = request.user.get('admin_role')
+    user_hostel = request.user.get('hostel')
     
     if admin_role not in ['warden', 'validator', 'dean']:
         return jsonify({'error': 'Only wardens and validators can view emergency complaints'}), 403
@@ -559,8 +530,22 @@ def get_emergency_complaints():
     status_filter = request.args.get('status')  # 'emergency' or 'resolved'
     hostel_filter = request.args.get('hostel')
     
-    # Build query - get all emergency complaints first
-    query = supabase.table('complaints').select('*').eq('is_emergency', True)
+    try:
+        fields = get_fields(COMPLAINT_LIST_FIELDS)
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Build query - emergency complaints joined with the filing student so the
+    # hostel restriction is applied by the database instead of per row
+    query = supabase.table('complaints').select(
+        f'{fields}, student:users!user_id!inner(name, student_id, hostel, room_number)'
+    ).eq('is_emergency', True)
+    
+    # Restrict to the admin's own hostel, then to the requested hostel
+    if user_hostel:
+        query = query.eq('student.hostel', user_hostel)
+    if hostel_filter:
+        query = query.eq('student.hostel', hostel_filter)
     
     # Apply status filter
     if status_filter:
@@ -569,34 +554,57 @@ def get_emergency_complaints():
     # Order by created_at descending
     result = query.order('created_at', desc=True).execute()
     
-    # Get user details and filter by hostel
-    complaints = []
-    for complaint in result.data:
-        # Get student details
-        user_result = supabase.table('users').select('name, student_id, hostel, room_number').eq('id', complaint['user_id']).execute()
-        
-        if user_result.data:
-            student_data = user_result.data[0]
-            student_hostel = student_data.get('hostel', '')
-            
-            # Filter by hostel if needed
-            if user_hostel and student_hostel != user_hostel:
-                continue
-            
-            if hostel_filter and student_hostel != hostel_filter:
-                continue
-            
-            complaint['student_name'] = student_data.get('name', 'Unknown')
-            complaint['student_id'] = student_data.get('student_id', '')
-            complaint['hostel'] = student_hostel
-            complaint['room_number'] = student_data.get('room_number', '')
-            complaints.append(complaint)
+    # Flatten the embedded student details onto each complaint
+    complaints = result.data or []
+    for complaint in complaints:
+        student_data = complaint.pop('student', None) or {}
+        complaint['student_name'] = student_data.get('name', 'Unknown')
+        complaint['student_id'] = student_data.get('student_id', '')
+        complaint['hostel'] = student_data.get('hostel', '')
+        complaint['room_number'] = student_data.get('room_number', '')
     
     return jsonify({
-        'complaints': complaints,
+        'complaints': redact_inline_photos(complaints),
         'admin_role': admin_role
     }), 200
 
+@bp.route('/complaints/emergency/stream-token', methods=['POST'])
+@token_required
+@role_required(['admin'])
+def get_emergency_stream_token():
+    """Short-lived token for opening the emergency stream with ?token="""
+    if request.user.get('admin_role') not in ['warden', 'validator', 'dean']:
+        return jsonify({'error': 'Only wardens and validators can view emergency complaints'}), 403
+    
+    # Dashboards keep polling when no stream is offered
+    if not events.available():
+        return jsonify({'error': 'Emergency stream is not available on this deployment'}), 404
+    
+    return jsonify({
+        'token': issue_stream_token(request.user),
+        'expires_in': STREAM_TOKEN_TTL_SECONDS
+    }), 200
+
+@bp.route('/complaints/emergency/stream', methods=['GET'])
+@token_required
+@role_required(['admin'])
+def stream_emergency_complaints():
+    """Server-Sent Events stream of new and resolved emergencies"""
+    admin_role = request.user.get('admin_role')
+    if admin_role not in ['warden', 'validator', 'dean']:
+        return jsonify({'error': 'Only wardens and validators can view emergency complaints'}), 403
+    
+    if not events.available():
+        return jsonify({'error': 'Emergency stream is not available on this deployment'}), 404
+    
+    subscription = events.subscribe(hostel=request.user.get('hostel'))
+    
+    stream = events.stream(subscription, max_seconds=Config.EVENT_STREAM_MAX_SECONDS)
+    return Response(stream, mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @bp.route('/complaints/<complaint_id>/resolve-emergency', methods=['POST'])
 @token_required
 @role_required(['admin'])
@@ -650,6 +658,10 @@ def resolve_emergency_complaint(complaint_id):
                         'emergency', 'resolved',
                         data.get('resolution_notes', 'Emergency resolved by warden'))
     
+    # Let dashboards watching this hostel drop the emergency immediately
+    student = load_users(supabase, [complaint_data['user_id']]).get(complaint_data['user_id']) or {}
+    events.publish('emergency_resolved', {'id': complaint_id}, hostel=student.get('hostel'), supabase=supabase)
+    
     return jsonify({
         'message': 'Emergency complaint resolved successfully',
         'complaint': result.data[0]
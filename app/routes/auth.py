@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify
 import jwt
 import hashlib
+import time
 from datetime import datetime, timedelta
 from config import Config
 from app.database import get_supabase_client
+from app.admin_roles import admin_claims, invalidate_admin_claims, ADMIN_CLAIMS_TTL_SECONDS
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -63,13 +65,18 @@ def login():
     if user['password_hash'] != password_hash:
         return jsonify({'error': 'Invalid credentials'}), 401
     
-    # Generate JWT token
-    token = jwt.encode({
+    # Generate JWT token (admins also carry their sub-role and hostel)
+    claims = {
         'user_id': user['id'],
         'student_id': user['student_id'],
         'role': user['role'],
         'exp': datetime.utcnow() + timedelta(days=7)
-    }, Config.JWT_SECRET_KEY, algorithm='HS256')
+    }
+    if user['role'] == 'admin':
+        claims.update(admin_claims(user), claims_exp=int(time.time()) + ADMIN_CLAIMS_TTL_SECONDS)
+        # Tokens issued earlier re-resolve their claims from this fresh row
+        invalidate_admin_claims(user['id'])
+    token = jwt.encode(claims, Config.JWT_SECRET_KEY, algorithm='HS256')
     
     return jsonify({
         'token': token,
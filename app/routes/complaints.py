@@ -2,6 +2,13 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime, timedelta
 from app.database import get_supabase_client
 from app.auth_middleware import token_required, role_required
+from app import events, hotspots
+from app.classifier import get_classifier
+from app.conditional import VALIDATOR_COLUMNS, scope_validator, list_etag, not_modified_response, with_etag
+from app.fanout import fan_out
+from app.pagination import get_page_args, paginate, InvalidCursor
+from app.sync import get_since, fetch_changes, latest_cursor
+from app.projection import get_fields, redact_inline_photos, InvalidFields, COMPLAINT_LIST_FIELDS
 
 bp = Blueprint('complaints', __name__, url_prefix='/api/complaints')
 
@@ -18,8 +25,7 @@ def create_complaint():
     supabase = get_supabase_client()
     
     # Check for emergency keywords
-    emergency_keywords = ['fire', 'water leakage', 'short circuit', 'medical emergency', 'urgent', 'emergency']
-    is_emergency = any(keyword in data['description'].lower() for keyword in emergency_keywords)
+    is_emergency = get_classifier().is_emergency(data['description'])
     
     complaint_data = {
         'user_id': request.user['user_id'],
@@ -36,6 +42,7 @@ def create_complaint():
     }
     
     result = supabase.table('complaints').insert(complaint_data).execute()
+    hotspots.record(data['category'], data['location'])
     
     return jsonify({
         'message': 'Complaint filed successfully',
@@ -56,12 +63,12 @@ def create_emergency_complaint():
     supabase = get_supabase_client()
     
     # Get student's hostel for notification routing
-    user = supabase.table('users').select('hostel, name').eq('id', request.user['user_id']).execute()
-    if not user.data:
+    user = request.auth.current_user
+    if not user:
         return jsonify({'error': 'User not found'}), 404
     
-    student_hostel = user.data[0].get('hostel')
-    student_name = user.data[0].get('name')
+    student_hostel = user.get('hostel')
+    student_name = user.get('name')
     
     # Create emergency complaint
     complaint_data = {
@@ -76,20 +83,21 @@ def create_emergency_complaint():
         'created_at': datetime.utcnow().isoformat()
     }
     
-    result = supabase.table('complaints').insert(complaint_data).execute()
+    # Insert the complaint while looking up the hostel's warden and validator
+    result, warden, validator = fan_out(
+        lambda: supabase.table('complaints').insert(complaint_data).execute(),
+        lambda: supabase.table('users').select('id').eq('role', 'admin').ilike('name', '%Warden%').eq('hostel', student_hostel).execute(),
+        lambda: supabase.table('users').select('id').eq('role', 'admin').ilike('name', '%Validator%').eq('hostel', student_hostel).execute()
+    )
     
     if not result.data:
         return jsonify({'error': 'Failed to create emergency complaint'}), 500
     
+    hotspots.record(data['category'], data['location'])
+    
     complaint = result.data[0]
     complaint_id = complaint['id']
     
-    # Find warden for this hostel
-    warden = supabase.table('users').select('id').eq('role', 'admin').ilike('name', '%Warden%').eq('hostel', student_hostel).execute()
-    
-    # Find validator for this hostel
-    validator = supabase.table('users').select('id').eq('role', 'admin').ilike('name', '%Validator%').eq('hostel', student_hostel).execute()
-    
     # Create notifications
     notifications = []
     
@@ -114,6 +122,15 @@ def create_emergency_complaint():
     if notifications:
         supabase.table('notifications').insert(notifications).execute()
     
+    # Push to admin dashboards streaming emergencies for this hostel
+    events.publish('emergency', {
+        'id': complaint_id,
+        'title': complaint['title'],
+        'location': complaint['location'],
+        'student_name': student_name,
+        'hostel': student_hostel
+    }, hostel=student_hostel, supabase=supabase)
+    
     return jsonify({
         'message': 'Emergency complaint submitted successfully',
         'complaint': complaint
@@ -122,23 +139,59 @@ def create_emergency_complaint():
 @bp.route('/', methods=['GET'])
 @token_required
 def get_complaints():
+    try:
+        limit, cursor = get_page_args()
+        since = get_since()
+        fields = get_fields(COMPLAINT_LIST_FIELDS)
+    except (InvalidCursor, InvalidFields) as e:
+        return jsonify({'error': str(e)}), 400
+    
     supabase = get_supabase_client()
     
-    if request.user['role'] == 'resident':
-        # Residents see only their complaints
-        result = supabase.table('complaints').select('*').eq('user_id', request.user['user_id']).order('created_at', desc=True).execute()
-    else:
+    def scoped(columns, **kwargs):
+        query = supabase.table('complaints').select(columns, **kwargs)
+        if request.user['role'] == 'resident':
+            # Residents see only their complaints
+            query = query.eq('user_id', request.user['user_id'])
         # Admin and workers see all complaints
-        result = supabase.table('complaints').select('*').order('created_at', desc=True).execute()
-    
-    return jsonify({'complaints': result.data}), 200
+        return query
+    
+    # Answer repeat loads from the client's cached copy when nothing changed
+    validator = scope_validator(scoped(VALIDATOR_COLUMNS, count='exact'))
+    etag = list_etag(validator)
+    cached = not_modified_response(etag)
+    if cached:
+        return cached
+    
+    if since:
+        # Delta sync: only complaints changed since the client's last load.
+        # This view only filters on user_id, which never changes, so
+        # complaints leave it only when deleted
+        tombstones = supabase.table('complaint_tombstones').select('complaint_id, deleted_at')
+        if request.user['role'] == 'resident':
+            tombstones = tombstones.eq('user_id', request.user['user_id'])
+        complaints, removed, sync_cursor = fetch_changes(since, [scoped], fields, tombstones, transitions=False)
+        return with_etag(jsonify({'complaints': redact_inline_photos(complaints), 'removed': removed, 'sync_cursor': sync_cursor}), etag), 200
+    
+    complaints, next_cursor = paginate(scoped(fields), limit, cursor)
+    
+    return with_etag(jsonify({
+        'complaints': redact_inline_photos(complaints),
+        'next_cursor': next_cursor,
+        'sync_cursor': latest_cursor(None, validator[1])
+    }), etag), 200
 
 @bp.route('/<complaint_id>', methods=['GET'])
 @token_required
 def get_complaint(complaint_id):
+    try:
+        fields = get_fields('*', required=('id', 'user_id'))
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    
     supabase = get_supabase_client()
     
-    result = supabase.table('complaints').select('*').eq('id', complaint_id).execute()
+    result = supabase.table('complaints').select(fields).eq('id', complaint_id).execute()
     
     if not result.data:
         return jsonify({'error': 'Complaint not found'}), 404
@@ -183,12 +236,17 @@ def get_complaints_by_location():
     if not hostel:
         return jsonify({'error': 'Hostel is required'}), 400
     
+    try:
+        fields = get_fields(COMPLAINT_LIST_FIELDS, required=('id', 'upvote_count'))
+    except InvalidFields as e:
+        return jsonify({'error': str(e)}), 400
+    
     supabase = get_supabase_client()
     user_id = request.user['user_id']
     
     # Get complaints from same hostel with pending/in_progress status
     # Search for complaints where location starts with the hostel name
-    complaints_result = supabase.table('complaints').select('*').ilike('location', f'{hostel}%').in_('status', ['pending', 'validated', 'assigned', 'in_progress']).order('upvote_count', desc=True).execute()
+    complaints_result = supabase.table('complaints').select(fields).ilike('location', f'{hostel}%').in_('status', ['pending', 'validated', 'assigned', 'in_progress']).order('upvote_count', desc=True).execute()
     
     # Check which complaints the user has already upvoted
     upvoted_result = supabase.table('complaint_upvotes').select('complaint_id').eq('user_id', user_id).execute()
@@ -201,7 +259,7 @@ def get_complaints_by_location():
         if complaint.get('upvote_count', 0) < 1:
             complaint['upvote_count'] = 1
     
-    return jsonify({'complaints': complaints_result.data}), 200
+    return jsonify({'complaints': redact_inline_photos(complaints_result.data)}), 200
 
 @bp.route('/<complaint_id>/upvote', methods=['POST'])
 @token_required
@@ -211,27 +269,17 @@ def upvote_complaint(complaint_id):
     supabase = get_supabase_client()
     user_id = request.user['user_id']
     
-    # Check if user already upvoted
-    existing = supabase.table('complaint_upvotes').select('*').eq('complaint_id', complaint_id).eq('user_id', user_id).execute()
+    # Insert the upvote and increment the count in one atomic call
+    result = supabase.rpc('toggle_upvote', {
+        'p_complaint_id': complaint_id,
+        'p_user_id': user_id,
+        'p_upvote': True
+    }).execute()
     
-    if existing.data:
+    if not result.data['changed']:
         return jsonify({'error': 'Already upvoted'}), 400
     
-    # Add upvote
-    upvote_data = {
-        'complaint_id': complaint_id,
-        'user_id': user_id,
-        'created_at': datetime.utcnow().isoformat()
-    }
-    
-    supabase.table('complaint_upvotes').insert(upvote_data).execute()
-    
-    # Increment upvote count (ensure it starts from 1)
-    complaint = supabase.table('complaints').select('upvote_count').eq('id', complaint_id).execute()
-    current_count = complaint.data[0].get('upvote_count', 0) if complaint.data else 0
-    new_count = max(current_count + 1, 1)  # Ensure at least 1
-    
-    supabase.table('complaints').update({'upvote_count': new_count}).eq('id', complaint_id).execute()
+    new_count = result.data['upvote_count']
     
     return jsonify({'message': 'Upvoted successfully', 'upvote_count': new_count}), 200
 
@@ -243,21 +291,18 @@ def remove_upvote(complaint_id):
     supabase = get_supabase_client()
     user_id = request.user['user_id']
     
-    # Check if user has upvoted
-    existing = supabase.table('complaint_upvotes').select('*').eq('complaint_id', complaint_id).eq('user_id', user_id).execute()
+    # Delete the upvote and decrement the count in one atomic call
+    # (never below 1 for the original filer)
+    result = supabase.rpc('toggle_upvote', {
+        'p_complaint_id': complaint_id,
+        'p_user_id': user_id,
+        'p_upvote': False
+    }).execute()
     
-    if not existing.data:
+    if not result.data['changed']:
         return jsonify({'error': 'You have not upvoted this complaint'}), 400
     
-    # Remove upvote
-    supabase.table('complaint_upvotes').delete().eq('complaint_id', complaint_id).eq('user_id', user_id).execute()
-    
-    # Decrement upvote count (but keep at least 1 for the original filer)
-    complaint = supabase.table('complaints').select('upvote_count').eq('id', complaint_id).execute()
-    current_count = complaint.data[0].get('upvote_count', 1) if complaint.data else 1
-    new_count = max(current_count - 1, 1)  # Never go below 1
-    
-    supabase.table('complaints').update({'upvote_count': new_count}).eq('id', complaint_id).execute()
+    new_count = result.data['upvote_count']
     
     return jsonify({'message': 'Upvote removed successfully', 'upvote_count': new_count}), 200
 
@@ -302,35 +347,18 @@ def rate_worker(complaint_id):
     feedback = data.get('feedback', '')
     
     try:
-        # Add rating to complaint
-        supabase.table('complaints').update({
-            'worker_rating': rating,
-            'rated_by': user_id,
-            'rated_at': datetime.utcnow().isoformat()
-        }).eq('id', complaint_id).execute()
-        
-        # Add to worker_ratings table
-        rating_data = {
-            'worker_id': worker_id,
-            'complaint_id': complaint_id,
-            'rated_by': user_id,
-            'rating': rating,
-            'feedback': feedback,
-            'created_at': datetime.utcnow().isoformat()
-        }
-        supabase.table('worker_ratings').insert(rating_data).execute()
-        
-        # Update worker's average rating
-        all_ratings = supabase.table('worker_ratings').select('rating').eq('worker_id', worker_id).execute()
+        # Record the rating and update the worker's running aggregate atomically
+        result = supabase.rpc('submit_worker_rating', {
+            'p_complaint_id': complaint_id,
+            'p_worker_id': worker_id,
+            'p_rated_by': user_id,
+            'p_rating': rating,
+            'p_feedback': feedback
+        }).execute()
         
-        if all_ratings.data:
-            total_ratings = len(all_ratings.data)
-            avg_rating = sum(r['rating'] for r in all_ratings.data) / total_ratings
-            
-            supabase.table('users').update({
-                'average_rating': round(avg_rating, 2),
-                'total_ratings': total_ratings
-            }).eq('id', worker_id).execute()
+        # A concurrent submission got there first
+        if not result.data['rated']:
+            return jsonify({'error': 'Already rated'}), 400
         
         return jsonify({
             'message': 'Rating submitted successfully',
@@ -2,8 +2,12 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime
 from app.database import get_supabase_client
 from app.auth_middleware import token_required, role_required
-import base64
-import uuid
+from app.conditional import VALIDATOR_COLUMNS, scope_validator, list_etag, not_modified_response, with_etag
+from app.fanout import fan_out
+from app.pagination import get_page_args, paginate, InvalidCursor
+from app.photos import save_request_photo, photo_fields, queue_photo_upload, discard_photo, PhotoError
+from app.sync import get_since, fetch_changes, latest_cursor
+from app.projection import get_fields, redact_inline_photos, InvalidFields, COMPLAINT_LIST_FIELDS
 
 bp = Blueprint('worker', __name__, url_prefix='/api/worker')
 
@@ -11,12 +15,40 @@ bp = Blueprint('worker', __name__, url_prefix='/api/worker')
 @token_required
 @role_required(['worker'])
 def get_tasks():
+    try:
+        limit, cursor = get_page_args()
+        since = get_since()
+        fields = get_fields(COMPLAINT_LIST_FIELDS)
+    except (InvalidCursor, InvalidFields) as e:
+        return jsonify({'error': str(e)}), 400
+    
     supabase = get_supabase_client()
     
     # Get complaints assigned to this worker
-    result = supabase.table('complaints').select('*').eq('assigned_to', request.user['user_id']).order('created_at', desc=True).execute()
-    
-    return jsonify({'tasks': result.data}), 200
+    def scoped(columns, table='complaints', **kwargs):
+        return supabase.table(table).select(columns, **kwargs).eq('assigned_to', request.user['user_id'])
+    
+    # Answer repeat loads from the client's cached copy when nothing changed
+    validator = scope_validator(scoped(VALIDATOR_COLUMNS, count='exact'))
+    etag = list_etag(validator)
+    cached = not_modified_response(etag)
+    if cached:
+        return cached
+    
+    if since:
+        # Delta sync: tasks changed since the client's last load, plus tasks
+        # reassigned away from this worker or deleted
+        tombstones = supabase.table('complaint_tombstones').select('complaint_id, deleted_at').eq('assigned_to', request.user['user_id'])
+        tasks, removed, sync_cursor = fetch_changes(since, [scoped], fields, tombstones)
+        return with_etag(jsonify({'tasks': redact_inline_photos(tasks), 'removed': removed, 'sync_cursor': sync_cursor}), etag), 200
+    
+    tasks, next_cursor = paginate(scoped(fields), limit, cursor)
+    
+    return with_etag(jsonify({
+        'tasks': redact_inline_photos(tasks),
+        'next_cursor': next_cursor,
+        'sync_cursor': latest_cursor(None, validator[1])
+    }), etag), 200
 
 @bp.route('/tasks/<complaint_id>/update', methods=['PATCH'])
 @token_required
@@ -27,7 +59,7 @@ def update_task(complaint_id):
     supabase = get_supabase_client()
     
     # Verify task is assigned to this worker
-    complaint = supabase.table('complaints').select('*').eq('id', complaint_id).execute()
+    complaint = supabase.table('complaints').select('id, assigned_to').eq('id', complaint_id).execute()
     
     if not complaint.data:
         return jsonify({'error': 'Task not found'}), 404
@@ -53,15 +85,16 @@ def update_task(complaint_id):
 @token_required
 @role_required(['worker'])
 def upload_progress_photo(complaint_id):
-    data = request.get_json()
+    # JSON bodies carry a base64 photo; anything else is streamed as multipart/binary
+    data = request.get_json() if request.is_json else None
     
-    if not data.get('photo'):
+    if data is not None and not data.get('photo'):
         return jsonify({'error': 'No photo provided'}), 400
     
     supabase = get_supabase_client()
     
     # Verify task is assigned to this worker
-    complaint = supabase.table('complaints').select('*').eq('id', complaint_id).execute()
+    complaint = supabase.table('complaints').select('id, assigned_to').eq('id', complaint_id).execute()
     
     if not complaint.data:
         return jsonify({'error': 'Task not found'}), 404
@@ -70,40 +103,33 @@ def upload_progress_photo(complaint_id):
         return jsonify({'error': 'Unauthorized'}), 403
     
     try:
-        # Try to upload to Supabase Storage first
-        photo_url = data['photo']  # Default to base64 data URL
-        
         try:
-            photo_data = data['photo'].split(',')[1] if ',' in data['photo'] else data['photo']
-            photo_bytes = base64.b64decode(photo_data)
-            
-            file_name = f"progress_{complaint_id}_{uuid.uuid4()}.jpg"
-            bucket_name = "complaint-photos"
-            
-            # Upload to storage
-            supabase.storage.from_(bucket_name).upload(file_name, photo_bytes, {
-                "content-type": "image/jpeg"
-            })
-            
-            # Get public URL
-            photo_url = supabase.storage.from_(bucket_name).get_public_url(file_name)
-        except Exception as storage_error:
-            # If storage fails, store base64 directly in database
-            print(f"Storage upload failed, using base64: {storage_error}")
-            photo_url = data['photo']
+            photo = save_request_photo(supabase, data)
+        except PhotoError as e:
+            return jsonify({'error': str(e)}), e.status_code
         
         # Update complaint with progress photo
         update_data = {
-            'progress_photo_url': photo_url,
             'status': 'in_progress',
             'updated_at': datetime.utcnow().isoformat()
         }
+        update_data.update(photo_fields(photo, 'progress_photo_url'))
+        
+        try:
+            result = supabase.table('complaints').update(update_data).eq('id', complaint_id).execute()
+        except Exception:
+            # Nothing refers to the spooled photo yet
+            discard_photo(photo)
+            raise
         
-        result = supabase.table('complaints').update(update_data).eq('id', complaint_id).execute()
+        # Upload a spooled photo only after the row records it as pending
+        queue_photo_upload(photo, complaint_id, 'progress_photo_url')
         
         return jsonify({
             'message': 'Progress photo uploaded',
-            'photo_url': photo_url,
+            'photo_url': update_data['progress_photo_url'],
+            'photo_status': update_data['progress_photo_status'],
+            'thumbnail_url': update_data.get('progress_thumbnail_url'),
             'task': result.data[0]
         }), 200
         
@@ -114,15 +140,16 @@ def upload_progress_photo(complaint_id):
 @token_required
 @role_required(['worker'])
 def upload_completion_photo(complaint_id):
-    data = request.get_json()
+    # JSON bodies carry a base64 photo; anything else is streamed as multipart/binary
+    data = request.get_json() if request.is_json else None
     
-    if not data.get('photo'):
+    if data is not None and not data.get('photo'):
         return jsonify({'error': 'No photo provided'}), 400
     
     supabase = get_supabase_client()
     
     # Verify task is assigned to this worker
-    complaint = supabase.table('complaints').select('*').eq('id', complaint_id).execute()
+    complaint = supabase.table('complaints').select('id, assigned_to').eq('id', complaint_id).execute()
     
     if not complaint.data:
         return jsonify({'error': 'Task not found'}), 404
@@ -131,51 +158,45 @@ def upload_completion_photo(complaint_id):
         return jsonify({'error': 'Unauthorized'}), 403
     
     try:
-        # Try to upload to Supabase Storage first
-        photo_url = data['photo']  # Default to base64 data URL
-        
         try:
-            photo_data = data['photo'].split(',')[1] if ',' in data['photo'] else data['photo']
-            photo_bytes = base64.b64decode(photo_data)
-            
-            file_name = f"completion_{complaint_id}_{uuid.uuid4()}.jpg"
-            bucket_name = "complaint-photos"
-            
-            # Upload to storage
-            supabase.storage.from_(bucket_name).upload(file_name, photo_bytes, {
-                "content-type": "image/jpeg"
-            })
-            
-            # Get public URL
-            photo_url = supabase.storage.from_(bucket_name).get_public_url(file_name)
-        except Exception as storage_error:
-            # If storage fails, store base64 directly in database
-            print(f"Storage upload failed, using base64: {storage_error}")
-            photo_url = data['photo']
+            photo = save_request_photo(supabase, data)
+        except PhotoError as e:
+            return jsonify({'error': str(e)}), e.status_code
         
         # Update complaint with completion photo and mark as completed
         update_data = {
-            'completion_photo_url': photo_url,
             'status': 'completed',
             'completed_at': datetime.utcnow().isoformat(),
             'updated_at': datetime.utcnow().isoformat()
         }
+        update_data.update(photo_fields(photo, 'completion_photo_url'))
+        
+        notes = (data if data is not None else request.form or request.args).get('notes')
+        if notes:
+            update_data['completion_notes'] = notes
         
-        if data.get('notes'):
-            update_data['completion_notes'] = data['notes']
+        try:
+            result = supabase.table('complaints').update(update_data).eq('id', complaint_id).execute()
+        except Exception:
+            # Nothing refers to the spooled photo yet
+            discard_photo(photo)
+            raise
         
-        result = supabase.table('complaints').update(update_data).eq('id', complaint_id).execute()
+        # Upload a spooled photo only after the row records it as pending
+        queue_photo_upload(photo, complaint_id, 'completion_photo_url')
         
         # Update worker's completed tasks count
         worker_id = request.user['user_id']
-        worker = supabase.table('users').select('completed_tasks').eq('id', worker_id).execute()
-        if worker.data:
-            new_count = (worker.data[0].get('completed_tasks') or 0) + 1
+        worker = request.auth.current_user
+        if worker:
+            new_count = (worker.get('completed_tasks') or 0) + 1
             supabase.table('users').update({'completed_tasks': new_count}).eq('id', worker_id).execute()
         
         return jsonify({
             'message': 'Task completed with photo',
-            'photo_url': photo_url,
+            'photo_url': update_data['completion_photo_url'],
+            'photo_status': update_data['completion_photo_status'],
+            'thumbnail_url': update_data.get('completion_thumbnail_url'),
             'task': result.data[0]
         }), 200
         
@@ -191,7 +212,7 @@ def complete_task(complaint_id):
     supabase = get_supabase_client()
     
     # Verify task is assigned to this worker
-    complaint = supabase.table('complaints').select('*').eq('id', complaint_id).execute()
+    complaint = supabase.table('complaints').select('id, assigned_to').eq('id', complaint_id).execute()
     
     if not complaint.data:
         return jsonify({'error': 'Task not found'}), 404
@@ -218,20 +239,19 @@ def get_worker_profile():
     supabase = get_supabase_client()
     worker_id = request.user['user_id']
     
-    # Get worker details
-    worker = supabase.table('users').select('*').eq('id', worker_id).execute()
+    # Worker details (on this thread, it uses the request), rating history and
+    # completed tasks are fetched in parallel
+    worker, ratings, completed = fan_out(
+        lambda: request.auth.current_user,
+        lambda: supabase.table('worker_ratings').select('*').eq('worker_id', worker_id).order('created_at', desc=True).execute(),
+        lambda: supabase.table('complaints').select('*').eq('assigned_to', worker_id).eq('status', 'completed').execute()
+    )
     
-    if not worker.data:
+    if not worker:
         return jsonify({'error': 'Worker not found'}), 404
     
-    # Get rating history
-    ratings = supabase.table('worker_ratings').select('*').eq('worker_id', worker_id).order('created_at', desc=True).execute()
-    
-    # Get completed tasks
-    completed = supabase.table('complaints').select('*').eq('assigned_to', worker_id).eq('status', 'completed').execute()
-    
     return jsonify({
-        'profile': worker.data[0],
+        'profile': worker,
         'ratings': ratings.data,
-        'completed_tasks': completed.data
+        'completed_tasks': redact_inline_photos(completed.data)
     }), 200
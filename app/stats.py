@@ -0,0 +1,46 @@
+from app.fanout import fan_out
+
+def count_complaints(supabase, **filters):
+    """Row count computed by the database without transferring rows"""
+    query = supabase.table('complaints').select('id', count='exact', head=True)
+    for column, value in filters.items():
+        query = query.eq(column, value)
+    return query.execute().count or 0
+
+def get_complaint_stats(supabase):
+    """Complaint counts by status/priority plus per-category and per-hostel breakdowns"""
+    try:
+        result = supabase.rpc('complaint_stats').execute()
+        if result.data:
+            return result.data
+    except Exception as e:
+        # Fall back to counting queries if sql/complaint_stats.sql is not installed
+        print(f"Warning: complaint_stats RPC unavailable: {e}")
+
+    total, pending, in_progress, resolved, high_priority = fan_out(
+        lambda: count_complaints(supabase),
+        lambda: count_complaints(supabase, status='pending'),
+        lambda: count_complaints(supabase, status='in_progress'),
+        lambda: count_complaints(supabase, status='resolved'),
+        lambda: count_complaints(supabase, priority='high')
+    )
+    return {
+        'total': total,
+        'pending': pending,
+        'in_progress': in_progress,
+        'resolved': resolved,
+        'high_priority': high_priority,
+        'by_category': {},
+        'by_hostel': {}
+    }
+
+def get_worker_task_counts(supabase):
+    """Task counts per worker and status, grouped in the database.
+
+    Returns {worker_id: {status: count}}; needs sql/worker_task_counts.sql.
+    """
+    result = supabase.rpc('worker_task_counts').execute()
+    counts = {}
+    for row in (result.data or []):
+        counts.setdefault(row['worker_id'], {})[row['status']] = row['task_count']
+    return counts
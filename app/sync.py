@@ -0,0 +1,99 @@
+import base64
+import json
+from datetime import datetime, timezone
+from flask import request
+from app.fanout import fan_out
+from app.pagination import InvalidCursor, parse_timestamp
+
+# Most rows read from each source (view, transitions, tombstones) per delta
+# sync, keeping every query under Supabase's 1000-row response cap
+SYNC_LIMIT = 500
+
+def encode_sync_cursor(updated_at):
+    """Opaque ?since= cursor for changes after updated_at"""
+    return base64.urlsafe_b64encode(json.dumps({'since': updated_at}).encode()).decode()
+
+def get_since():
+    """Decode ?since= into a timestamp, or None for a full load"""
+    since = request.args.get('since')
+    if not since:
+        return None
+    try:
+        since = json.loads(base64.urlsafe_b64decode(since.encode()).decode())['since']
+    except Exception:
+        raise InvalidCursor('Invalid since cursor')
+    return parse_timestamp(since)
+
+def _instant(timestamp):
+    """Comparable datetime for an ISO timestamp; naive values are taken as UTC"""
+    parsed = datetime.fromisoformat(timestamp)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def latest_cursor(since, *timestamps):
+    """Sync cursor for the newest of the given timestamps (ISO strings in UTC)"""
+    newest = max([t for t in (since,) + timestamps if t], key=_instant, default=None)
+    return encode_sync_cursor(newest) if newest else None
+
+def _changed_since(query, column, since):
+    return query.gte(column, since).order(column).limit(SYNC_LIMIT)
+
+def fetch_changes(since, views, fields, tombstones, transitions=True):
+    """Rows in the caller's view changed since `since`, and ids that left it.
+
+    views are the functions building the caller's filtered list queries,
+    called as view(columns, table=...). With transitions, the same filters
+    are applied to complaint_transitions, which holds the previous values of
+    complaints whose filtered columns changed, so only complaints that were
+    in this view before a change are checked for having left it. tombstones
+    queries complaint_tombstones. Rows are inclusive of `since`; clients
+    merge by id so repeats are harmless.
+
+    Returns (rows, removed_ids, sync_cursor).
+    """
+    # The cursor is built from updated_at, so select it whatever ?fields= asked for
+    if fields != '*' and 'updated_at' not in [field.strip() for field in fields.split(',')]:
+        fields = f'{fields}, updated_at'
+
+    # Built here rather than in fan_out, as the views may read request
+    sources = [(_changed_since(tombstones, 'deleted_at', since), 'deleted_at')]
+    sources += [(_changed_since(view(fields), 'updated_at', since), 'updated_at') for view in views]
+    if transitions:
+        sources += [
+            (_changed_since(view('complaint_id, changed_at', table='complaint_transitions'), 'changed_at', since), 'changed_at')
+            for view in views
+        ]
+    results = fan_out(*[lambda query=query: query.execute().data or [] for query, _ in sources])
+    results = list(zip(results, [column for _, column in sources]))
+
+    # A source that filled its limit may have more rows after its last one,
+    # so this sync only covers changes up to the earliest such row and the
+    # cursor stops there; the client picks up the rest on its next sync
+    bounds = [rows[-1][column] for rows, column in results if len(rows) >= SYNC_LIMIT]
+    if bounds:
+        bound = min(bounds, key=_instant)
+        results = [
+            ([row for row in rows if _instant(row[column]) <= _instant(bound)], column)
+            for rows, column in results
+        ]
+        cursor = latest_cursor(since, bound)
+    else:
+        cursor = latest_cursor(since, *[row[column] for rows, column in results for row in rows])
+
+    deleted = results[0][0]
+    rows = [row for view_rows, _ in results[1:1 + len(views)] for row in view_rows]
+    in_view = {row['id'] for row in rows}
+    departed = list(dict.fromkeys(
+        row['complaint_id'] for moved, _ in results[1 + len(views):] for row in moved
+        if row['complaint_id'] not in in_view
+    ))
+
+    if departed and bounds:
+        # The views were cut off at the bound, so a complaint that changed
+        # again after it may still be in view without being in rows
+        queries = [view('id').in_('id', departed) for view in views]
+        current = fan_out(*[lambda query=query: query.execute().data or [] for query in queries])
+        still_in_view = {row['id'] for view_rows in current for row in view_rows}
+        departed = [complaint_id for complaint_id in departed if complaint_id not in still_in_view]
+
+    removed = departed + [row['complaint_id'] for row in deleted]
+    return rows, removed, cursor
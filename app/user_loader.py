@@ -0,0 +1,52 @@
+from flask import g, has_app_context
+
+# Columns fetched for every user loaded through the batch loader
+USER_FIELDS = 'id, name, student_id, email, hostel, room_number'
+
+def _identity_map():
+    """Per-request cache of user rows keyed by id"""
+    if not has_app_context():
+        return {}
+    if not hasattr(g, 'user_identity_map'):
+        g.user_identity_map = {}
+    return g.user_identity_map
+
+def remember_user(user):
+    """Seed the per-request identity map with a row loaded elsewhere"""
+    _identity_map()[user['id']] = user
+
+def load_users(supabase, user_ids):
+    """Fetch users by id in one query, reusing rows already loaded in this request"""
+    identity_map = _identity_map()
+    missing = list({uid for uid in user_ids if uid and uid not in identity_map})
+
+    if missing:
+        result = supabase.table('users').select(USER_FIELDS).in_('id', missing).execute()
+        for user in (result.data or []):
+            identity_map[user['id']] = user
+        # Remember misses too so they are not re-queried
+        for uid in missing:
+            identity_map.setdefault(uid, None)
+
+    return {uid: identity_map.get(uid) for uid in user_ids if uid}
+
+def attach_student_info(supabase, complaints):
+    """Add student_name, student_id and student_email to each complaint"""
+    try:
+        users = load_users(supabase, [c.get('user_id') for c in complaints])
+    except Exception as e:
+        print(f"Error fetching user info: {e}")
+        for complaint in complaints:
+            if complaint.get('user_id'):
+                complaint['student_name'] = 'Unknown'
+                complaint['student_id'] = 'N/A'
+        return complaints
+
+    for complaint in complaints:
+        user = users.get(complaint.get('user_id'))
+        if user:
+            complaint['student_name'] = user.get('name', 'Unknown')
+            complaint['student_id'] = user.get('student_id', 'N/A')
+            complaint['student_email'] = user.get('email', 'N/A')
+
+    return complaints
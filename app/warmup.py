@@ -0,0 +1,28 @@
+import threading
+import time
+
+_started = False
+_lock = threading.Lock()
+
+def warm_up():
+    """Build the lazily created singletons so the first request doesn't pay for them"""
+    started = time.perf_counter()
+    try:
+        from app.database import get_supabase_client
+        from app.classifier import get_classifier
+        get_supabase_client()
+        get_classifier()
+    except Exception as e:
+        print(f"Warning: warm-up failed: {e}")
+        return None
+    return (time.perf_counter() - started) * 1000
+
+def start_warm_up():
+    """Run warm_up() once in a background thread; returns False if already started"""
+    global _started
+    with _lock:
+        if _started:
+            return False
+        _started = True
+    threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+    return True
@@ -0,0 +1,96 @@
+"""Per-description cost of emergency detection with a large keyword list.
+
+Checks word-boundary handling on a few fixed reports, then compares the old
+substring loop with the compiled classifier:
+
+    python benchmarks/classifier_benchmark.py [--keywords 1000] [--descriptions 5000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.classifier import DEFAULT_KEYWORDS, EmergencyClassifier
+
+# (description, expected) pairs checked before timing; Hindi reports usually
+# end with a danda and must still match, but a keyword inside a longer word
+# (आग in आगे) must not
+SELF_CHECK_KEYWORDS = {'en': DEFAULT_KEYWORDS['en'], 'hi': ['आग', 'बिजली']}
+SELF_CHECK = [
+    ('हॉस्टल में आग', True),
+    ('हॉस्टल में आग।', True),
+    ('बिजली॥', True),
+    ('आग१', True),
+    ('आगे बढ़ो', False),
+    ('Short-circuit in room 12', True),
+    ('fireworks tonight', False),
+]
+
+def self_check():
+    classifier = EmergencyClassifier(SELF_CHECK_KEYWORDS)
+    failures = [(text, expected) for text, expected in SELF_CHECK if classifier.is_emergency(text) != expected]
+    for text, expected in failures:
+        print(f"self-check failed: {text!r} should {'' if expected else 'not '}be an emergency")
+    return not failures
+
+def random_word(rng, length):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+def make_keywords(rng, count):
+    keywords = list(DEFAULT_KEYWORDS['en'])
+    while len(keywords) < count:
+        words = [random_word(rng, rng.randint(4, 9)) for _ in range(rng.randint(1, 2))]
+        keywords.append(' '.join(words))
+    return keywords
+
+def make_descriptions(rng, count, keywords):
+    descriptions = []
+    for _ in range(count):
+        words = [random_word(rng, rng.randint(2, 8)) for _ in range(rng.randint(15, 60))]
+        # About one in ten descriptions mentions a keyword
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        descriptions.append(' '.join(words))
+    return descriptions
+
+def substring_loop(keywords, descriptions):
+    return [any(keyword in d.lower() for keyword in keywords) for d in descriptions]
+
+def time_per_item(func, count):
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) / count * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--keywords', type=int, default=1000)
+    parser.add_argument('--descriptions', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if not self_check():
+        sys.exit(1)
+    print(f"self-check: {len(SELF_CHECK)} reports classified as expected")
+
+    rng = random.Random(args.seed)
+    keywords = make_keywords(rng, args.keywords)
+    descriptions = make_descriptions(rng, args.descriptions, keywords)
+
+    started = time.perf_counter()
+    classifier = EmergencyClassifier({'bench': keywords})
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    loop_us = time_per_item(lambda: substring_loop(keywords, descriptions), len(descriptions))
+    compiled_us = time_per_item(lambda: classifier.classify_batch(descriptions), len(descriptions))
+
+    print(f"{len(keywords)} keywords, {len(descriptions)} descriptions")
+    print(f"compile:          {compile_ms:8.1f} ms (once per process)")
+    print(f"substring loop:   {loop_us:8.1f} us/description")
+    print(f"compiled pattern: {compiled_us:8.1f} us/description")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Cold-start cost of the API: process start to first response.
+
+Each run starts a fresh interpreter, imports app.py and serves one request
+through the Flask test client, the same work a new serverless instance does.
+The app runs with its default configuration, including the escalation
+scheduler; --serverless sets VERCEL=1 to measure the serverless defaults:
+
+    python benchmarks/cold_start_benchmark.py [--runs 5] [--path /health] [--serverless] [--importtime]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Runs in the child process; prints timings as JSON on its last line
+CHILD = '''
+import json, sys, threading, time
+started = time.perf_counter()
+import importlib.util
+spec = importlib.util.spec_from_file_location('wsgi_app', 'app.py')
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+imported = time.perf_counter()
+response = module.app.test_client().get(sys.argv[1])
+responded = time.perf_counter()
+print(json.dumps({
+    'status': response.status_code,
+    'import_ms': (imported - started) * 1000,
+    'request_ms': (responded - imported) * 1000,
+    'supabase_loaded': 'supabase' in sys.modules,
+    'scheduler_started': any(t.name == 'escalation-scheduler' for t in threading.enumerate()),
+}))
+'''
+
+def run_once(path, serverless=False, importtime=False):
+    env = dict(os.environ, VERCEL='1') if serverless else dict(os.environ)
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', CHILD, path]
+    started = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+    total_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['total_ms'] = total_ms
+    return timings, result.stderr
+
+def slowest_imports(importtime_output, limit=10):
+    """Modules with the largest cumulative import time from -X importtime"""
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nesting is shown by indentation; keep only the outermost imports
+        rows.append((len(name) - len(name.lstrip()), int(cumulative), name.strip()))
+    top_level = min((depth for depth, _, _ in rows), default=0)
+    return sorted(((c, n) for depth, c, n in rows if depth == top_level), reverse=True)[:limit]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--path', default='/health', help='first request to serve')
+    parser.add_argument('--serverless', action='store_true', help='start the app with VERCEL=1')
+    parser.add_argument('--importtime', action='store_true', help='also list the slowest top-level imports')
+    args = parser.parse_args()
+
+    runs = [run_once(args.path, args.serverless)[0] for _ in range(args.runs)]
+    print(f"GET {args.path} -> {runs[0]['status']}, supabase imported: {runs[0]['supabase_loaded']}, "
+          f"escalation scheduler started: {runs[0]['scheduler_started']}")
+    for key in ('import_ms', 'request_ms', 'total_ms'):
+        values = [run[key] for run in runs]
+        print(f"{key:<11} median {statistics.median(values):8.1f} ms  min {min(values):8.1f} ms")
+
+    if args.importtime:
+        _, stderr = run_once(args.path, args.serverless, importtime=True)
+        print('\nslowest top-level imports (cumulative):')
+        for cumulative, name in slowest_imports(stderr):
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+if __name__ == '__main__':
+    main()
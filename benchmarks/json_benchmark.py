@@ -0,0 +1,90 @@
+"""Encode time and bytes on the wire for a large complaint list.
+
+Serves a generated list through a stock Flask app (json module, no
+compression) and through one set up with app.responses, then reports
+per-response time and size for each negotiated encoding:
+
+    python benchmarks/json_benchmark.py [--complaints 5000] [--repeat 10]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask import Flask, jsonify
+from app.projection import COMPLAINT_LIST_FIELDS
+from app import responses
+
+CATEGORIES = ['electrical', 'plumbing', 'cleaning', 'internet', 'furniture']
+STATUSES = ['pending', 'validated', 'assigned', 'in_progress', 'completed', 'resolved']
+
+def make_complaints(rng, count):
+    started = datetime(2024, 1, 1)
+    complaints = []
+    for i in range(count):
+        created_at = started + timedelta(minutes=rng.randint(0, 500000))
+        complaint = {field: None for field in COMPLAINT_LIST_FIELDS}
+        complaint.update({
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'user_id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'title': f'Complaint {i}',
+            'description': ' '.join(rng.choice(['fan', 'light', 'tap', 'leaking', 'broken', 'room', 'not', 'working'])
+                                    for _ in range(rng.randint(10, 40))),
+            'category': rng.choice(CATEGORIES),
+            'location': f'Hostel {rng.choice("ABCD")} - Room {rng.randint(100, 450)}',
+            'status': rng.choice(STATUSES),
+            'priority': rng.choice(['low', 'medium', 'high']),
+            'is_emergency': rng.random() < 0.02,
+            'upvote_count': rng.randint(1, 30),
+            'created_at': created_at.isoformat(),
+            'updated_at': (created_at + timedelta(hours=rng.randint(0, 72))).isoformat(),
+        })
+        complaints.append(complaint)
+    return complaints
+
+def make_app(complaints, optimised):
+    app = Flask(__name__)
+    if optimised:
+        responses.init_app(app)
+
+    @app.route('/complaints')
+    def complaints_list():
+        return jsonify({'complaints': complaints, 'next_cursor': None}), 200
+
+    return app
+
+def measure(app, accept_encoding, repeat):
+    client = app.test_client()
+    headers = {'Accept-Encoding': accept_encoding} if accept_encoding else {}
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get('/complaints', headers=headers)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(response.data), response.headers.get('Content-Encoding', 'identity')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--complaints', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    complaints = make_complaints(random.Random(args.seed), args.complaints)
+    print(f"{args.complaints} complaints, median of {args.repeat} responses "
+          f"(orjson: {responses.orjson is not None}, brotli: {responses.brotli is not None})")
+    print(f"{'pipeline':<10} {'encoding':<10} {'ms':>8} {'bytes':>10}")
+
+    cases = [('before', False, ''), ('after', True, ''), ('after', True, 'gzip'), ('after', True, 'br, gzip')]
+    for label, optimised, accept_encoding in cases:
+        ms, size, encoding = measure(make_app(complaints, optimised), accept_encoding, args.repeat)
+        print(f"{label:<10} {encoding:<10} {ms:8.1f} {size:10,}")
+
+if __name__ == '__main__':
+    main()
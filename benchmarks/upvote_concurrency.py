@@ -0,0 +1,81 @@
+"""Hammer toggle_upvote with parallel calls and check the count stays exact.
+
+Every resident picked upvotes the same complaint several times at once, then
+removes the upvote several times at once. Afterwards upvote_count and the
+complaint_upvotes rows must match exactly. Runs against the configured
+Supabase project and leaves the complaint as it found it:
+
+    python benchmarks/upvote_concurrency.py --complaint-id <id> [--users 200] [--repeat 3] [--threads 64]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.database import get_supabase_client
+
+def upvote_state(supabase, complaint_id):
+    """(upvote_count, number of complaint_upvotes rows) for the complaint"""
+    complaint = supabase.table('complaints').select('upvote_count').eq('id', complaint_id).execute()
+    rows = supabase.table('complaint_upvotes').select('user_id', count='exact', head=True) \
+        .eq('complaint_id', complaint_id).execute()
+    return complaint.data[0]['upvote_count'], rows.count or 0
+
+def toggle(supabase, complaint_id, user_id, upvote):
+    result = supabase.rpc('toggle_upvote', {
+        'p_complaint_id': complaint_id,
+        'p_user_id': user_id,
+        'p_upvote': upvote
+    }).execute()
+    return result.data['changed']
+
+def run_phase(supabase, complaint_id, user_ids, upvote, repeat, threads):
+    """Send every toggle repeat times in parallel; returns (changed calls, seconds)"""
+    calls = [user_id for user_id in user_ids for _ in range(repeat)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        changed = sum(executor.map(lambda user_id: toggle(supabase, complaint_id, user_id, upvote), calls))
+    return changed, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--complaint-id', required=True)
+    parser.add_argument('--users', type=int, default=200, help='residents voting at once')
+    parser.add_argument('--repeat', type=int, default=3, help='duplicate calls per resident')
+    parser.add_argument('--threads', type=int, default=64)
+    args = parser.parse_args()
+
+    supabase = get_supabase_client()
+    existing = {row['user_id'] for row in supabase.table('complaint_upvotes').select('user_id')
+                .eq('complaint_id', args.complaint_id).execute().data or []}
+    residents = supabase.table('users').select('id').eq('role', 'resident').limit(args.users + len(existing)).execute()
+    user_ids = [row['id'] for row in residents.data or [] if row['id'] not in existing][:args.users]
+    if not user_ids:
+        sys.exit('No residents without an upvote on this complaint')
+
+    initial_count, initial_rows = upvote_state(supabase, args.complaint_id)
+    failures = []
+
+    changed, seconds = run_phase(supabase, args.complaint_id, user_ids, True, args.repeat, args.threads)
+    count, rows = upvote_state(supabase, args.complaint_id)
+    print(f"upvote: {len(user_ids) * args.repeat} calls in {seconds:.1f}s, {changed} changed, "
+          f"count {initial_count} -> {count}, rows {initial_rows} -> {rows}")
+    if changed != len(user_ids) or count != initial_count + len(user_ids) or rows != initial_rows + len(user_ids):
+        failures.append('upvote')
+
+    changed, seconds = run_phase(supabase, args.complaint_id, user_ids, False, args.repeat, args.threads)
+    count, rows = upvote_state(supabase, args.complaint_id)
+    print(f"remove: {len(user_ids) * args.repeat} calls in {seconds:.1f}s, {changed} changed, "
+          f"count -> {count}, rows -> {rows}")
+    if changed != len(user_ids) or count != initial_count or rows != initial_rows:
+        failures.append('remove')
+
+    if failures:
+        sys.exit(f"FAILED: {', '.join(failures)} phase lost or duplicated updates")
+    print('OK: every resident counted exactly once')
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,38 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
 
 class Config:
+    # Set by Vercel (and AWS Lambda): no long-lived threads or local files
+    SERVERLESS = os.getenv('VERCEL') == '1' or bool(os.getenv('AWS_LAMBDA_FUNCTION_NAME'))
     SUPABASE_URL = os.getenv('SUPABASE_URL')
     SUPABASE_KEY = os.getenv('SUPABASE_KEY')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-secret-key')
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
+    # Seconds between background escalation sweeps; 0 disables the scheduler
+    # (the default on serverless, where every cold start would run a sweep)
+    ESCALATION_INTERVAL_SECONDS = int(os.getenv('ESCALATION_INTERVAL_SECONDS', 0 if SERVERLESS else 60))
+    # Largest photo accepted by the streaming upload endpoints
+    MAX_PHOTO_BYTES = int(os.getenv('MAX_PHOTO_BYTES', 15 * 1024 * 1024))
+    # Upload worker photos from a background pool instead of the request thread;
+    # off on serverless, where the thread and the spooled file die with the response
+    PHOTO_UPLOAD_ASYNC = os.getenv('PHOTO_UPLOAD_ASYNC', '0' if SERVERLESS else '1') == '1'
+    PHOTO_UPLOAD_WORKERS = int(os.getenv('PHOTO_UPLOAD_WORKERS', 4))
+    PHOTO_UPLOAD_QUEUE_SIZE = int(os.getenv('PHOTO_UPLOAD_QUEUE_SIZE', 32))
+    PHOTO_SPOOL_DIR = os.getenv('PHOTO_SPOOL_DIR', os.path.join(tempfile.gettempdir(), 'complaint-photo-spool'))
+    # Optional JSON file of extra emergency keyword sets, e.g. {"hi": [...], "mr": [...]}
+    EMERGENCY_KEYWORDS_FILE = os.getenv('EMERGENCY_KEYWORDS_FILE')
+    # Create the Supabase client and other lazy singletons in the background at startup
+    WARM_UP_ON_START = os.getenv('WARM_UP_ON_START', '0') == '1'
+    # Threads shared by handlers running independent queries in parallel; 0 runs them in sequence
+    FANOUT_WORKERS = int(os.getenv('FANOUT_WORKERS', 8))
+    # Compress JSON/text responses of at least this many bytes with brotli or gzip
+    COMPRESS_RESPONSES = os.getenv('COMPRESS_RESPONSES', '1') == '1'
+    COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+    # Direct Postgres connection string; lets emergency events reach streams held by other processes
+    DATABASE_URL = os.getenv('DATABASE_URL')
+    # End event streams after this many seconds so the browser reconnects (0 = never);
+    # serverless functions are cut off at their max duration anyway
+    EVENT_STREAM_MAX_SECONDS = int(os.getenv('EVENT_STREAM_MAX_SECONDS', 8 if SERVERLESS else 0))
@@ -1,6 +1,6 @@
 import axios from 'axios';
 
-const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:5002/api';
+export const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:5002/api';
 
 const api = axios.create({
   baseURL: API_URL,
@@ -26,8 +26,8 @@ export const auth = {
 export const complaints = {
   create: (data) => api.post('/complaints/', data),
   createEmergency: (data) => api.post('/complaints/emergency', data),
-  getAll: () => api.get('/complaints/'),
-  getOne: (id) => api.get(`/complaints/${id}`),
+  getAll: (params) => api.get('/complaints/', { params }),
+  getOne: (id, params) => api.get(`/complaints/${id}`, { params }),
   updateStatus: (id, status) => api.patch(`/complaints/${id}/status`, { status }),
   getByLocation: (data) => api.post('/complaints/by-location', data),
   upvote: (id) => api.post(`/complaints/${id}/upvote`),
@@ -38,6 +38,7 @@ export const complaints = {
 export const admin = {
   getAllComplaints: (params) => api.get('/admin/complaints', { params }),
   getEmergencyComplaints: (params) => api.get('/admin/complaints/emergency', { params }),
+  getEmergencyStreamToken: () => api.post('/admin/complaints/emergency/stream-token'),
   resolveEmergency: (id, data) => api.post(`/admin/complaints/${id}/resolve-emergency`, data),
   validate: (id, data) => api.post(`/admin/complaints/${id}/validate`, data),
   assign: (id, data) => api.post(`/admin/complaints/${id}/assign`, data),
@@ -45,18 +46,45 @@ export const admin = {
   getWorkers: () => api.get('/admin/workers'),
   getStats: () => api.get('/admin/stats'),
   getDashboard: () => api.get('/admin/dashboard'),
+  getHotspots: (params) => api.get('/admin/hotspots', { params }),
   getWorkerPerformance: () => api.get('/admin/workers/performance'),
   getWorkerDetails: (id) => api.get(`/admin/workers/${id}/details`),
   checkUnassignedEscalations: () => api.post('/admin/complaints/check-unassigned'),
 };
 
+// Photos are sent as multipart so the backend can stream them to storage
+const photoForm = (photo) => {
+  const form = new FormData();
+  form.append('photo', photo);
+  return form;
+};
+const multipart = { headers: { 'Content-Type': 'multipart/form-data' } };
+
 export const worker = {
-  getTasks: () => api.get('/worker/tasks'),
+  getTasks: (params) => api.get('/worker/tasks', { params }),
   updateTask: (id, data) => api.patch(`/worker/tasks/${id}/update`, data),
   completeTask: (id, data) => api.post(`/worker/tasks/${id}/complete`, data),
-  uploadProgressPhoto: (id, photo) => api.post(`/worker/tasks/${id}/upload-progress-photo`, { photo }),
-  uploadCompletionPhoto: (id, photo) => api.post(`/worker/tasks/${id}/upload-completion-photo`, { photo }),
+  uploadProgressPhoto: (id, photo) => api.post(`/worker/tasks/${id}/upload-progress-photo`, photoForm(photo), multipart),
+  uploadCompletionPhoto: (id, photo) => api.post(`/worker/tasks/${id}/upload-completion-photo`, photoForm(photo), multipart),
   getProfile: () => api.get('/worker/profile'),
 };
 
+// List views blank out legacy inline (base64) photos and set has_*_photo
+// instead; load one from the detail endpoint when the user asks for it
+export const openInlinePhoto = async (id, column) => {
+  const view = window.open('', '_blank');
+  const response = await complaints.getOne(id, { fields: column });
+  const image = view.document.createElement('img');
+  image.src = response.data.complaint[column];
+  image.style.maxWidth = '100%';
+  view.document.body.appendChild(image);
+};
+
+// Apply a ?since= delta response to a list loaded earlier: replace or add
+// changed rows by id and drop the ones the server reports as removed
+export const mergeChanges = (list, changed, removed) => {
+  const dropped = new Set([...(removed || []), ...changed.map((item) => item.id)]);
+  return [...changed, ...list.filter((item) => !dropped.has(item.id))];
+};
+
 export default api;
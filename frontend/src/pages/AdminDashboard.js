@@ -1,11 +1,13 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { admin } from '../api';
+import { admin, API_URL, mergeChanges, openInlinePhoto } from '../api';
 
 function AdminDashboard() {
   const navigate = useNavigate();
   const user = JSON.parse(localStorage.getItem('user') || '{}');
   const [complaintsList, setComplaintsList] = useState([]);
+  const complaintsRef = useRef([]);
+  const syncCursor = useRef(null);
   const [stats, setStats] = useState({});
   const [adminRole, setAdminRole] = useState('');
   const [selectedComplaint, setSelectedComplaint] = useState(null);
@@ -30,19 +32,85 @@ function AdminDashboard() {
     loadWorkers();
     loadEmergencyComplaints();
     
-    // Auto-refresh emergency complaints every 30 seconds
+    // Reload as soon as the server pushes a change; poll every 30 seconds
+    // only while no stream is connected
+    let source = null;
+    let retry = null;
+    let closed = false;
+    let connected = false;
+    // Set by the server's 'bye' before it ends a stream on purpose
+    let plannedClose = false;
+    // Whether events may have been missed since the last load
+    let needsCatchUp = true;
+
     const interval = setInterval(() => {
-      loadEmergencyComplaints();
+      if (!connected) loadEmergencyComplaints();
     }, 30000);
-    
-    return () => clearInterval(interval);
+
+    const connect = async () => {
+      if (!window.EventSource || closed) return;
+      let token;
+      try {
+        // Short-lived stream token, so the login token never appears in URLs
+        token = (await admin.getEmergencyStreamToken()).data.token;
+      } catch (err) {
+        // Admins without access to emergencies, or deployments without a
+        // stream, just keep polling
+        if (![403, 404].includes(err.response?.status)) retry = setTimeout(connect, 30000);
+        return;
+      }
+      if (closed) return;
+      source = new EventSource(
+        `${API_URL}/admin/complaints/emergency/stream?token=${encodeURIComponent(token)}`
+      );
+      source.addEventListener('open', () => {
+        connected = true;
+        // Catch up on anything published while disconnected
+        if (needsCatchUp) loadEmergencyComplaints();
+        needsCatchUp = false;
+      });
+      source.addEventListener('emergency', loadEmergencyComplaints);
+      source.addEventListener('emergency_resolved', loadEmergencyComplaints);
+      source.addEventListener('bye', () => {
+        plannedClose = true;
+      });
+      source.addEventListener('error', () => {
+        // After a 'bye' the browser reconnects within seconds; stay quiet
+        if (!plannedClose) {
+          connected = false;
+          needsCatchUp = true;
+        }
+        plannedClose = false;
+        // The browser gives up once the token expires; reopen with a new one
+        if (source.readyState === EventSource.CLOSED) {
+          connected = false;
+          needsCatchUp = true;
+          retry = setTimeout(connect, 5000);
+        }
+      });
+    };
+    connect();
+
+    return () => {
+      closed = true;
+      clearInterval(interval);
+      clearTimeout(retry);
+      if (source) source.close();
+    };
   }, []);
 
   const loadData = async () => {
     try {
-      const response = await admin.getAllComplaints();
+      // After the first load only fetch what changed since the last one
+      const since = syncCursor.current;
+      const response = await admin.getAllComplaints(since ? { since } : undefined);
+      syncCursor.current = response.data.sync_cursor || null;
+      const loaded = since
+        ? mergeChanges(complaintsRef.current, response.data.complaints || [], response.data.removed)
+        : response.data.complaints || [];
+      complaintsRef.current = loaded;
       // Sort complaints: Emergency first, then by upvote_count
-      const sortedComplaints = (response.data.complaints || []).sort((a, b) => {
+      const sortedComplaints = [...loaded].sort((a, b) => {
         // Emergency complaints always come first
         if (a.is_emergency && !b.is_emergency) return -1;
         if (!a.is_emergency && b.is_emergency) return 1;
@@ -422,11 +490,16 @@ function AdminDashboard() {
                 </p>
 
                 {/* Progress Photo */}
+                {!complaint.progress_photo_url && complaint.has_progress_photo && (
+                  <button className="btn btn-secondary" style={{ marginTop: '15px' }} onClick={() => openInlinePhoto(complaint.id, 'progress_photo_url')}>
+                    📸 View progress photo
+                  </button>
+                )}
                 {complaint.progress_photo_url && (
                   <div style={{ marginTop: '15px' }}>
                     <p><strong>📸 Progress Photo (Before Work):</strong></p>
                     <img 
-                      src={complaint.progress_photo_url} 
+                      src={complaint.progress_thumbnail_url || complaint.progress_photo_url} 
                       alt="Progress" 
                       style={{ 
                         maxWidth: '100%', 
@@ -442,11 +515,16 @@ function AdminDashboard() {
                 )}
 
                 {/* Completion Photo */}
+                {!complaint.completion_photo_url && complaint.has_completion_photo && (
+                  <button className="btn btn-secondary" style={{ marginTop: '15px' }} onClick={() => openInlinePhoto(complaint.id, 'completion_photo_url')}>
+                    📸 View completion photo
+                  </button>
+                )}
                 {complaint.completion_photo_url && (
                   <div style={{ marginTop: '15px' }}>
                     <p><strong>✅ Completion Photo (After Work):</strong></p>
                     <img 
-                      src={complaint.completion_photo_url} 
+                      src={complaint.completion_thumbnail_url || complaint.completion_photo_url} 
                       alt="Completed" 
                       style={{ 
                         maxWidth: '100%', 
@@ -765,11 +843,16 @@ function AdminDashboard() {
                         </p>
                       </div>
 
+                      {!complaint.progress_photo_url && complaint.has_progress_photo && (
+                        <button className="btn btn-secondary" style={{ marginTop: '15px' }} onClick={() => openInlinePhoto(complaint.id, 'progress_photo_url')}>
+                          📸 View progress photo
+                        </button>
+                      )}
                       {complaint.progress_photo_url && (
                         <div style={{ marginTop: '15px' }}>
                           <p><strong>📸 Progress Photo:</strong></p>
                           <img 
-                            src={complaint.progress_photo_url} 
+                            src={complaint.progress_thumbnail_url || complaint.progress_photo_url} 
                             alt="Progress" 
                             style={{ 
                               maxWidth: '300px', 
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { complaints } from '../api';
+import { complaints, openInlinePhoto } from '../api';
 
 function StudentDashboard() {
   const navigate = useNavigate();
@@ -398,7 +398,7 @@ function StudentDashboard() {
                         {complaint.is_emergency && <span className="badge badge-high">EMERGENCY</span>}
                       </div>
 
-                      {complaint.progress_photo_url && (
+                      {(complaint.progress_photo_url || complaint.has_progress_photo) && (
                         <div style={{ marginTop: '15px', padding: '10px', background: '#f0f8ff', borderRadius: '5px' }}>
                           <p style={{ fontSize: '14px', color: '#27ae60', margin: '0' }}>
                             📸 Worker has uploaded progress photo
@@ -406,7 +406,7 @@ function StudentDashboard() {
                         </div>
                       )}
 
-                      {complaint.completion_photo_url && (
+                      {(complaint.completion_photo_url || complaint.has_completion_photo) && (
                         <div style={{ marginTop: '15px', padding: '10px', background: '#f0fff4', borderRadius: '5px' }}>
                           <p style={{ fontSize: '14px', color: '#27ae60', margin: '0' }}>
                             ✅ Work completed! Click "View Resolved" to see photos and rate
@@ -451,11 +451,16 @@ function StudentDashboard() {
                       {complaint.is_emergency && <span className="badge badge-high">EMERGENCY</span>}
                     </div>
 
+                    {!complaint.progress_photo_url && complaint.has_progress_photo && (
+                      <button className="btn btn-secondary" style={{ marginTop: '15px' }} onClick={() => openInlinePhoto(complaint.id, 'progress_photo_url')}>
+                        📸 View progress photo
+                      </button>
+                    )}
                     {complaint.progress_photo_url && (
                       <div style={{ marginTop: '15px' }}>
                         <p><strong>📸 Progress Photo (Worker Started):</strong></p>
                         <img 
-                          src={complaint.progress_photo_url} 
+                          src={complaint.progress_thumbnail_url || complaint.progress_photo_url} 
                           alt="Progress" 
                           style={{ 
                             maxWidth: '100%', 
@@ -504,17 +509,27 @@ function StudentDashboard() {
                       <span className={`badge badge-${complaint.priority}`}>{complaint.priority} priority</span>
                     </div>
                     
+                    {!complaint.progress_photo_url && complaint.has_progress_photo && (
+                      <button className="btn btn-secondary" style={{ marginTop: '15px' }} onClick={() => openInlinePhoto(complaint.id, 'progress_photo_url')}>
+                        📸 View progress photo
+                      </button>
+                    )}
                     {complaint.progress_photo_url && (
                       <div style={{ marginTop: '15px' }}>
                         <p><strong>Progress Photo:</strong></p>
-                        <img src={complaint.progress_photo_url} alt="Progress" style={{ maxWidth: '300px', borderRadius: '8px', marginTop: '5px' }} />
+                        <img src={complaint.progress_thumbnail_url || complaint.progress_photo_url} alt="Progress" style={{ maxWidth: '300px', borderRadius: '8px', marginTop: '5px' }} />
                       </div>
                     )}
                     
+                    {!complaint.completion_photo_url && complaint.has_completion_photo && (
+                      <button className="btn btn-secondary" style={{ marginTop: '15px' }} onClick={() => openInlinePhoto(complaint.id, 'completion_photo_url')}>
+                        📸 View completion photo
+                      </button>
+                    )}
                     {complaint.completion_photo_url && (
                       <div style={{ marginTop: '15px' }}>
                         <p><strong>Completion Photo:</strong></p>
-                        <img src={complaint.completion_photo_url} alt="Completed" style={{ maxWidth: '300px', borderRadius: '8px', marginTop: '5px' }} />
+                        <img src={complaint.completion_thumbnail_url || complaint.completion_photo_url} alt="Completed" style={{ maxWidth: '300px', borderRadius: '8px', marginTop: '5px' }} />
                       </div>
                     )}
                     
@@ -1,17 +1,21 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { worker } from '../api';
+import { worker, mergeChanges, openInlinePhoto } from '../api';
 import './WorkerDashboard.css';
 
 function WorkerDashboard() {
   const navigate = useNavigate();
   const user = JSON.parse(localStorage.getItem('user') || '{}');
   const [tasks, setTasks] = useState([]);
+  const tasksRef = useRef([]);
+  const syncCursor = useRef(null);
   const [profile, setProfile] = useState(null);
   const [activeTab, setActiveTab] = useState('pending');
   const [selectedTask, setSelectedTask] = useState(null);
   const [progressPhoto, setProgressPhoto] = useState(null);
   const [completionPhoto, setCompletionPhoto] = useState(null);
+  const [progressFile, setProgressFile] = useState(null);
+  const [completionFile, setCompletionFile] = useState(null);
   const [uploading, setUploading] = useState(false);
 
   useEffect(() => {
@@ -21,8 +25,14 @@ function WorkerDashboard() {
 
   const loadTasks = async () => {
     try {
-      const response = await worker.getTasks();
-      setTasks(response.data.tasks);
+      // After the first load only fetch tasks changed since the last one
+      const since = syncCursor.current;
+      const response = await worker.getTasks(since ? { since } : undefined);
+      syncCursor.current = response.data.sync_cursor || null;
+      tasksRef.current = since
+        ? mergeChanges(tasksRef.current, response.data.tasks, response.data.removed)
+        : response.data.tasks;
+      setTasks(tasksRef.current);
     } catch (err) {
       console.error('Failed to load tasks', err);
     }
@@ -40,6 +50,11 @@ function WorkerDashboard() {
   const handlePhotoCapture = (e, type) => {
     const file = e.target.files[0];
     if (file) {
+      if (type === 'progress') {
+        setProgressFile(file);
+      } else {
+        setCompletionFile(file);
+      }
       const reader = new FileReader();
       reader.onloadend = () => {
         if (type === 'progress') {
@@ -60,9 +75,10 @@ function WorkerDashboard() {
 
     setUploading(true);
     try {
-      await worker.uploadProgressPhoto(taskId, progressPhoto);
+      await worker.uploadProgressPhoto(taskId, progressFile);
       alert('Progress photo uploaded! Task marked as in progress.');
       setProgressPhoto(null);
+      setProgressFile(null);
       setSelectedTask(null);
       loadTasks();
     } catch (err) {
@@ -80,9 +96,10 @@ function WorkerDashboard() {
 
     setUploading(true);
     try {
-      await worker.uploadCompletionPhoto(taskId, completionPhoto);
+      await worker.uploadCompletionPhoto(taskId, completionFile);
       alert('Task completed! Photo uploaded successfully.');
       setCompletionPhoto(null);
+      setCompletionFile(null);
       setSelectedTask(null);
       loadTasks();
       loadProfile(); // Refresh profile to update completed tasks count
@@ -118,11 +135,16 @@ function WorkerDashboard() {
         <span className={`badge badge-${task.priority}`}>{task.priority}</span>
       </div>
 
+      {!task.progress_photo_url && task.has_progress_photo && (
+        <button className="btn btn-secondary" style={{ marginTop: '15px' }} onClick={() => openInlinePhoto(task.id, 'progress_photo_url')}>
+          📸 View progress photo
+        </button>
+      )}
       {task.progress_photo_url && (
         <div className="photo-preview">
           <p><strong>Progress Photo:</strong></p>
           <img 
-            src={task.progress_photo_url} 
+            src={task.progress_thumbnail_url || task.progress_photo_url} 
             alt="Progress" 
             onClick={() => window.open(task.progress_photo_url, '_blank')}
             style={{ cursor: 'pointer' }}
@@ -130,11 +152,16 @@ function WorkerDashboard() {
         </div>
       )}
 
+      {!task.completion_photo_url && task.has_completion_photo && (
+        <button className="btn btn-secondary" style={{ marginTop: '15px' }} onClick={() => openInlinePhoto(task.id, 'completion_photo_url')}>
+          📸 View completion photo
+        </button>
+      )}
       {task.completion_photo_url && (
         <div className="photo-preview">
           <p><strong>Completion Photo:</strong></p>
           <img 
-            src={task.completion_photo_url} 
+            src={task.completion_thumbnail_url || task.completion_photo_url} 
             alt="Completed" 
             onClick={() => window.open(task.completion_photo_url, '_blank')}
             style={{ cursor: 'pointer' }}
@@ -158,7 +185,7 @@ function WorkerDashboard() {
             Upload Progress Photo & Start Work
           </button>
         )}
-        {task.status === 'in_progress' && !task.completion_photo_url && (
+        {task.status === 'in_progress' && !task.completion_photo_url && !task.has_completion_photo && (
           <button 
             className="btn btn-success" 
             onClick={() => setSelectedTask({ id: task.id, action: 'complete' })}
@@ -286,6 +313,16 @@ function WorkerDashboard() {
               </div>
             </div>
 
+            {profile.profile.rating_histogram && (
+              <div className="ratings-list">
+                {[5, 4, 3, 2, 1].map((stars) => (
+                  <p key={stars}>
+                    {renderStars(stars)} {profile.profile.rating_histogram[stars] || 0}
+                  </p>
+                ))}
+              </div>
+            )}
+
             <h3>Recent Ratings</h3>
             <div className="ratings-list">
               {profile.ratings && profile.ratings.length > 0 ? (
@@ -0,0 +1,14 @@
+-- Cross-process emergency events for GET /api/admin/complaints/emergency/stream:
+-- the API publishes through this function and every instance holding streams
+-- LISTENs on the complaint_events channel (needs DATABASE_URL on the API)
+create or replace function publish_complaint_event(p_event text, p_hostel text, p_data json)
+returns void
+language plpgsql
+as $$
+begin
+  perform pg_notify(
+    'complaint_events',
+    json_build_object('event', p_event, 'hostel', p_hostel, 'data', p_data)::text
+  );
+end;
+$$;
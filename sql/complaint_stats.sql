@@ -0,0 +1,32 @@
+-- Aggregated complaint statistics for GET /api/admin/stats
+create or replace function complaint_stats()
+returns json
+language sql
+stable
+as $$
+  select json_build_object(
+    'total', count(*),
+    'pending', count(*) filter (where c.status = 'pending'),
+    'in_progress', count(*) filter (where c.status = 'in_progress'),
+    'resolved', count(*) filter (where c.status = 'resolved'),
+    'high_priority', count(*) filter (where c.priority = 'high'),
+    'by_category', (
+      select coalesce(json_object_agg(category, n), '{}'::json)
+      from (
+        select coalesce(category, 'Unknown') as category, count(*) as n
+        from complaints
+        group by 1
+      ) s
+    ),
+    'by_hostel', (
+      select coalesce(json_object_agg(hostel, n), '{}'::json)
+      from (
+        select coalesce(u.hostel, 'Unknown') as hostel, count(*) as n
+        from complaints c2
+        left join users u on u.id = c2.user_id
+        group by 1
+      ) s
+    )
+  )
+  from complaints c;
+$$;
@@ -0,0 +1,26 @@
+-- Deleted complaints, so ?since= delta syncs can tell clients to drop them
+create table if not exists complaint_tombstones (
+  complaint_id uuid primary key,
+  user_id uuid,
+  assigned_to uuid,
+  deleted_at timestamptz not null default now()
+);
+
+create index if not exists complaint_tombstones_deleted_at_idx on complaint_tombstones (deleted_at);
+
+create or replace function record_complaint_tombstone()
+returns trigger
+language plpgsql
+as $$
+begin
+  insert into complaint_tombstones (complaint_id, user_id, assigned_to, deleted_at)
+  values (old.id, old.user_id, old.assigned_to, now())
+  on conflict (complaint_id) do update set deleted_at = excluded.deleted_at;
+  return old;
+end;
+$$;
+
+drop trigger if exists complaints_record_tombstone on complaints;
+create trigger complaints_record_tombstone
+  after delete on complaints
+  for each row execute function record_complaint_tombstone();
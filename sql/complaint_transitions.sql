@@ -0,0 +1,37 @@
+-- Previous values of the columns list views filter on, recorded whenever one
+-- changes, so ?since= delta syncs can find complaints that left a caller's
+-- view (e.g. reassigned away from a worker) without scanning every change
+create table if not exists complaint_transitions (
+  id bigserial primary key,
+  complaint_id uuid not null,
+  user_id uuid,
+  assigned_to uuid,
+  status text,
+  category text,
+  priority text,
+  is_emergency boolean,
+  changed_at timestamptz not null default now()
+);
+
+create index if not exists complaint_transitions_changed_at_idx on complaint_transitions (changed_at);
+create index if not exists complaint_transitions_assigned_to_idx on complaint_transitions (assigned_to, changed_at);
+
+create or replace function record_complaint_transition()
+returns trigger
+language plpgsql
+as $$
+begin
+  if (old.user_id, old.assigned_to, old.status, old.category, old.priority, old.is_emergency)
+     is distinct from
+     (new.user_id, new.assigned_to, new.status, new.category, new.priority, new.is_emergency) then
+    insert into complaint_transitions (complaint_id, user_id, assigned_to, status, category, priority, is_emergency, changed_at)
+    values (old.id, old.user_id, old.assigned_to, old.status, old.category, old.priority, old.is_emergency, now());
+  end if;
+  return new;
+end;
+$$;
+
+drop trigger if exists complaints_record_transition on complaints;
+create trigger complaints_record_transition
+  after update on complaints
+  for each row execute function record_complaint_transition();
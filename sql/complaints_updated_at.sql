@@ -0,0 +1,23 @@
+-- Keep complaints.updated_at current on every write so list endpoints can
+-- answer If-None-Match from max(updated_at) and a row count
+update complaints set updated_at = coalesce(updated_at, created_at, now()) where updated_at is null;
+
+alter table complaints alter column updated_at set default now();
+alter table complaints alter column updated_at set not null;
+
+create or replace function touch_complaint_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.updated_at := now();
+  return new;
+end;
+$$;
+
+drop trigger if exists complaints_touch_updated_at on complaints;
+create trigger complaints_touch_updated_at
+  before insert or update on complaints
+  for each row execute function touch_complaint_updated_at();
+
+create index if not exists complaints_updated_at_idx on complaints (updated_at desc);
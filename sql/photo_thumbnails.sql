@@ -0,0 +1,3 @@
+-- Thumbnail URLs stored next to the worker progress/completion photos
+alter table complaints add column if not exists progress_thumbnail_url text;
+alter table complaints add column if not exists completion_thumbnail_url text;
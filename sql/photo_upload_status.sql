@@ -0,0 +1,5 @@
+-- Background photo upload state for the worker photo endpoints
+-- (pending while the spooled photo is uploading, then uploaded or failed;
+-- inline when storage was unavailable and the base64 data URL was saved)
+alter table complaints add column if not exists progress_photo_status text;
+alter table complaints add column if not exists completion_photo_status text;
@@ -0,0 +1,57 @@
+-- Atomic "Me too!" toggle for POST /api/complaints/<id>/upvote and /remove-upvote
+-- The old read-then-insert endpoint could store the same upvote twice; drop
+-- the extra rows and recount those complaints (filer + one per upvoter)
+-- before the unique index is built
+with removed as (
+  delete from complaint_upvotes a
+  using complaint_upvotes b
+  where a.complaint_id = b.complaint_id and a.user_id = b.user_id and a.ctid > b.ctid
+  returning a.complaint_id
+)
+-- Subqueries still see the rows being deleted, so subtract them
+update complaints c
+set upvote_count = 1
+  + (select count(*) from complaint_upvotes u where u.complaint_id = c.id)
+  - (select count(*) from removed r where r.complaint_id = c.id)
+where c.id in (select complaint_id from removed);
+
+create unique index if not exists complaint_upvotes_complaint_user_key
+  on complaint_upvotes (complaint_id, user_id);
+
+create or replace function toggle_upvote(
+  p_complaint_id complaint_upvotes.complaint_id%type,
+  p_user_id complaint_upvotes.user_id%type,
+  p_upvote boolean
+)
+returns json
+language plpgsql
+as $$
+declare
+  v_changed integer;
+  v_count integer;
+begin
+  if p_upvote then
+    insert into complaint_upvotes (complaint_id, user_id, created_at)
+    values (p_complaint_id, p_user_id, now())
+    on conflict (complaint_id, user_id) do nothing;
+  else
+    delete from complaint_upvotes
+    where complaint_id = p_complaint_id and user_id = p_user_id;
+  end if;
+
+  get diagnostics v_changed = row_count;
+
+  if v_changed > 0 then
+    -- Row lock on the complaint serialises concurrent increments;
+    -- the count never drops below 1 (the original filer)
+    update complaints
+    set upvote_count = greatest(coalesce(upvote_count, 1) + case when p_upvote then 1 else -1 end, 1)
+    where id = p_complaint_id
+    returning upvote_count into v_count;
+  else
+    select upvote_count into v_count from complaints where id = p_complaint_id;
+  end if;
+
+  return json_build_object('changed', v_changed > 0, 'upvote_count', greatest(coalesce(v_count, 1), 1));
+end;
+$$;
@@ -0,0 +1,81 @@
+-- Running rating aggregate per worker for POST /api/complaints/<id>/rate
+alter table users add column if not exists rating_sum integer not null default 0;
+alter table users add column if not exists rating_histogram jsonb not null
+  default '{"1": 0, "2": 0, "3": 0, "4": 0, "5": 0}'::jsonb;
+
+-- Backfill from existing ratings
+update users u
+set rating_sum = agg.rating_sum,
+    total_ratings = agg.total_ratings,
+    average_rating = round(agg.rating_sum::numeric / agg.total_ratings, 2),
+    rating_histogram = agg.rating_histogram
+from (
+  select worker_id,
+         sum(rating) as rating_sum,
+         count(*) as total_ratings,
+         jsonb_build_object(
+           '1', count(*) filter (where rating = 1),
+           '2', count(*) filter (where rating = 2),
+           '3', count(*) filter (where rating = 3),
+           '4', count(*) filter (where rating = 4),
+           '5', count(*) filter (where rating = 5)
+         ) as rating_histogram
+  from worker_ratings
+  group by worker_id
+) agg
+where u.id = agg.worker_id;
+
+create or replace function submit_worker_rating(
+  p_complaint_id complaints.id%type,
+  p_worker_id users.id%type,
+  p_rated_by users.id%type,
+  p_rating integer,
+  p_feedback text
+)
+returns json
+language plpgsql
+as $$
+declare
+  v_average numeric;
+  v_total integer;
+  v_histogram jsonb;
+  v_rated integer;
+begin
+  -- Only the first submission for a complaint counts; concurrent duplicates
+  -- block on the row lock, then see it already rated and change nothing
+  update complaints
+  set worker_rating = p_rating,
+      rated_by = p_rated_by,
+      rated_at = now()
+  where id = p_complaint_id and worker_rating is null;
+
+  get diagnostics v_rated = row_count;
+  if v_rated = 0 then
+    return json_build_object('rated', false);
+  end if;
+
+  insert into worker_ratings (worker_id, complaint_id, rated_by, rating, feedback, created_at)
+  values (p_worker_id, p_complaint_id, p_rated_by, p_rating, p_feedback, now());
+
+  -- Constant-time update: right-hand sides see the pre-update row
+  update users
+  set rating_sum = coalesce(rating_sum, 0) + p_rating,
+      total_ratings = coalesce(total_ratings, 0) + 1,
+      average_rating = round((coalesce(rating_sum, 0) + p_rating)::numeric / (coalesce(total_ratings, 0) + 1), 2),
+      rating_histogram = jsonb_set(
+        coalesce(rating_histogram, '{}'::jsonb),
+        array[p_rating::text],
+        to_jsonb(coalesce((rating_histogram ->> p_rating::text)::integer, 0) + 1)
+      )
+  where id = p_worker_id
+  returning average_rating, total_ratings, rating_histogram
+  into v_average, v_total, v_histogram;
+
+  return json_build_object(
+    'rated', true,
+    'average_rating', v_average,
+    'total_ratings', v_total,
+    'rating_histogram', v_histogram
+  );
+end;
+$$;
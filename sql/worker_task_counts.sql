@@ -0,0 +1,11 @@
+-- Per-worker task counts by status for GET /api/admin/workers/performance
+create or replace function worker_task_counts()
+returns table (worker_id complaints.assigned_to%type, status complaints.status%type, task_count bigint)
+language sql
+stable
+as $$
+  select assigned_to, status, count(*)
+  from complaints
+  where assigned_to is not null
+  group by assigned_to, status;
+$$;